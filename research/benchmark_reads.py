@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+PostGIS read benchmark: query_to_geodataframe vs query_to_geodataframe_fast.
+
+Runs the same query through both readers in db_connection.py, checks that
+they return the same GeoDataFrame, and reports the best and median wall time
+of each over several runs.
+
+Usage (from the research/ directory, with .env filled in):
+    python benchmark_reads.py
+    python benchmark_reads.py --repeat 5
+    python benchmark_reads.py --query "SELECT gid, geom FROM florida_coastline_1978"
+    python benchmark_reads.py --output ../data/benchmarks/reads.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from geopandas.testing import assert_geodataframe_equal
+
+from db_connection import query_to_geodataframe, query_to_geodataframe_fast, session
+
+DEFAULT_QUERY = """
+    SELECT segment_id, name, road_type, segment_certainty, length_m,
+           lower_date, upper_date, geometry AS geom
+    FROM roman_road_segments
+"""
+
+READERS = {
+    "read_postgis": query_to_geodataframe,
+    "fast": query_to_geodataframe_fast,
+}
+
+
+def time_reader(reader, query, geom_col, repeat):
+    """Run ``reader`` ``repeat`` times; return (last result, wall times in s)."""
+    timings = []
+    gdf = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        gdf = reader(query, geom_col=geom_col)
+        timings.append(time.perf_counter() - started)
+    return gdf, timings
+
+
+def main():
+    p = argparse.ArgumentParser(description="Compare the PostGIS → GeoDataFrame readers")
+    p.add_argument("--query", default=DEFAULT_QUERY, help="SQL to read (default: all road segments)")
+    p.add_argument("--geom-col", default="geom", help="Geometry column in the query output")
+    p.add_argument("--repeat", type=int, default=3, help="Timed runs per reader (default: 3)")
+    p.add_argument("--output", type=Path, default=None, help="Also write the results as JSON")
+    args = p.parse_args()
+
+    # Open a pooled connection up front so neither reader pays for it
+    with session():
+        pass
+
+    results = {}
+    frames = {}
+    for name, reader in READERS.items():
+        frames[name], timings = time_reader(reader, args.query, args.geom_col, args.repeat)
+        results[name] = {
+            "rows": len(frames[name]),
+            "best_s": round(min(timings), 4),
+            "median_s": round(statistics.median(timings), 4),
+        }
+
+    assert_geodataframe_equal(frames["read_postgis"], frames["fast"])
+
+    baseline = results["read_postgis"]["median_s"]
+    print(f"{'reader':<14}{'rows':>10}{'best s':>10}{'median s':>10}{'speedup':>9}")
+    for name, r in results.items():
+        speedup = baseline / r["median_s"] if r["median_s"] else float("nan")
+        r["speedup"] = round(speedup, 2)
+        print(f"{name:<14}{r['rows']:>10}{r['best_s']:>10.3f}{r['median_s']:>10.3f}{speedup:>8.1f}x")
+    print("Results identical: yes")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"query": args.query, "results": results}, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,82 @@ Database connection helpers for PostGIS → GeoDataFrame workflows.
 Usage:
     from db_connection import get_connection, query_to_dataframe, query_to_geodataframe
 
+    # Several queries on one pooled connection
+    from db_connection import session
+    with session() as conn:
+        sites = gpd.read_postgis(sites_sql, conn, geom_col="geom")
+        routes = gpd.read_postgis(routes_sql, conn, geom_col="geom")
+
 Credentials are read from a .env file in the research/ directory.
 Copy .env.example to .env and fill in your values.
+
+Queries share a process-wide connection pool, so a notebook pays the
+connection setup cost once per render instead of once per query. The pool
+size is set with PG_POOL_MAX (default 8) in .env.
+
+Pass cache=True to keep a query's result on disk (GeoParquet, under
+PG_QUERY_CACHE_DIR, default research/.cache/queries/). A repeat render reads
+the file instead of re-running the query until one of the tables it reads
+changes:
+
+    segments = query_to_geodataframe(segments_sql, cache=True)
+
+Independent queries can run in parallel, each on its own pooled connection:
+
+    layers = query_many({"sites": sites_sql, "routes": routes_sql})
+
+Large extracts can be streamed in chunks with bounded memory instead:
+
+    for chunk in query_to_geodataframe_chunks(roads_sql, chunk_size=20_000):
+        chunk.to_file("roads.gpkg", mode="a")
 """
 
+import atexit
+import binascii
+import hashlib
+import itertools
+import json
 import os
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
 from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import shapely
+
+try:
+    from pyarrow import ArrowException
+except ImportError:  # optional: only the query cache needs pyarrow
+    ArrowException = ImportError
 
 load_dotenv()
 
-def get_connection():
-    """Return a psycopg2 connection using .env credentials."""
-    return psycopg2.connect(
+# Pooled connections idle longer than this are pinged before reuse
+POOL_HEALTH_CHECK_SECONDS = 30
+
+QUERY_CACHE_DIR = Path(os.getenv("PG_QUERY_CACHE_DIR", Path(__file__).parent / ".cache" / "queries"))
+# Per-table version stamps bumped by the loaders (roman_roads_harvester.py)
+DATA_VERSIONS_TABLE = "public.data_versions"
+# Failures that make the query cache skip an entry instead of failing the query
+_CACHE_ERRORS = (ImportError, ValueError, ArrowException, OSError)
+
+# Rows per round trip / per yielded chunk when streaming
+DEFAULT_CHUNK_SIZE = 10_000
+_cursor_ids = itertools.count(1)
+
+
+def _connect_params():
+    return dict(
         host=os.getenv("PG_HOST", "localhost"),
         port=os.getenv("PG_PORT", "5432"),
         dbname=os.getenv("PG_DBNAME"),
@@ -28,25 +88,396 @@ def get_connection():
     )
 
 
-def query_to_dataframe(query, params=None):
-    """Run a SQL query and return results as a Pandas DataFrame."""
-    conn = get_connection()
+def get_connection():
+    """Return a psycopg2 connection using .env credentials."""
+    return psycopg2.connect(**_connect_params())
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+_pool = None
+_pool_slots = None  # bounds checkouts so callers wait instead of getting PoolError
+_pool_lock = threading.Lock()
+_last_used = {}  # id(conn) → time it was returned to the pool
+
+
+def get_pool():
+    """Return the process-wide ThreadedConnectionPool, creating it on first use."""
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            maxconn = int(os.getenv("PG_POOL_MAX", "8"))
+            _pool = ThreadedConnectionPool(
+                minconn=1,
+                maxconn=maxconn,
+                # Let the OS notice dead peers on long-lived idle connections
+                keepalives=1, keepalives_idle=60,
+                **_connect_params(),
+            )
+            # psycopg2 closes returned connections beyond minconn; raising it
+            # after construction keeps up to maxconn warm without opening
+            # them all up front
+            _pool.minconn = maxconn
+            _pool_slots = threading.BoundedSemaphore(maxconn)
+        return _pool
+
+
+def close_pool():
+    """Close every pooled connection (runs automatically at interpreter exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and not _pool.closed:
+            _pool.closeall()
+        _pool = None
+        _last_used.clear()
+
+
+atexit.register(close_pool)
+
+
+def _healthy(conn):
+    """True if a pooled connection is open and, when idle for a while, answers a ping."""
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < POOL_HEALTH_CHECK_SECONDS:
+        return True  # freshly opened or recently used
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+@contextmanager
+def session(timeout=None):
+    """Borrow a pooled connection for one or more queries.
+
+    Waits (up to ``timeout`` seconds, forever by default) when all PG_POOL_MAX
+    connections are in use. Broken connections are discarded and replaced;
+    any open transaction is rolled back when the block exits.
+    """
+    pool = get_pool()
+    slots = _pool_slots
+    if not slots.acquire(timeout=timeout):
+        raise TimeoutError(f"No pooled PostGIS connection free after {timeout}s")
+    conn = None
     try:
-        df = pd.read_sql_query(query, conn, params=params)
+        conn = pool.getconn()
+        if not _healthy(conn):
+            _last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        yield conn
     finally:
-        conn.close()
+        try:
+            if conn is not None:
+                broken = bool(conn.closed)
+                if not broken:
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        broken = True
+                if broken:
+                    _last_used.pop(id(conn), None)
+                else:
+                    _last_used[id(conn)] = time.monotonic()
+                pool.putconn(conn, close=broken)
+        finally:
+            slots.release()
+
+
+# ---------------------------------------------------------------------------
+# Query result cache
+# ---------------------------------------------------------------------------
+
+def _table_versions(conn):
+    """Return {"schema.table": version token} for every user table.
+
+    Tables the loaders stamp in data_versions use that stamp. Others fall
+    back to their storage file and row-change counters, which move on any
+    write, TRUNCATE or table swap.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (DATA_VERSIONS_TABLE,))
+        stamped = cur.fetchone()[0]
+        stamp_join = (
+            f"LEFT JOIN {DATA_VERSIONS_TABLE} v "
+            f"ON v.table_name = s.schemaname || '.' || s.relname"
+            if stamped else ""
+        )
+        stamp = "'v' || v.version || '@' || v.updated_at" if stamped else "NULL"
+        cur.execute(f"""
+            SELECT s.schemaname || '.' || s.relname,
+                   COALESCE({stamp},
+                            pg_relation_filenode(s.relid) || ':' || s.n_tup_ins
+                            || ':' || s.n_tup_upd || ':' || s.n_tup_del)
+            FROM pg_stat_user_tables s {stamp_join}
+        """)
+        versions = dict(cur.fetchall())
+    conn.rollback()
+    return versions
+
+
+def _referenced_versions(conn, query):
+    """Version tokens of the tables whose names appear in ``query``."""
+    # Quoted names may start with a digit, e.g. "1978_fl_coastline"
+    words = set(re.findall(r"[a-z0-9_$]+", query.lower()))
+    return {
+        name: token for name, token in _table_versions(conn).items()
+        if name.split(".", 1)[1].lower() in words
+    }
+
+
+def _cache_key(kind, query, params, crs, geom_col):
+    key = json.dumps([kind, query, params, str(crs), geom_col], default=str, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _cached_query(kind, query, params, crs, geom_col, run):
+    """Return ``run(conn)``'s frame, from the on-disk cache while it is current.
+
+    An entry is a GeoParquet (or Parquet) file plus a JSON sidecar holding the
+    version tokens of the tables the query read; it is reused only while
+    every token still matches. A cache that cannot be read or written (a
+    corrupt file, an unwritable directory, a column Parquet cannot hold) only
+    costs the cache: the query is run and its frame returned.
+    """
+    key = _cache_key(kind, query, params, crs, geom_col)
+    data_path = QUERY_CACHE_DIR / f"{key}.parquet"
+    meta_path = QUERY_CACHE_DIR / f"{key}.json"
+    read = gpd.read_parquet if kind == "geodataframe" else pd.read_parquet
+
+    with session() as conn:
+        versions = _referenced_versions(conn, query)
+        if versions and meta_path.exists() and data_path.exists():
+            try:
+                if json.loads(meta_path.read_text()).get("tables") == versions:
+                    return read(data_path)
+            except _CACHE_ERRORS as exc:
+                warnings.warn(f"Ignoring unreadable cache entry {key}: {exc}")
+        frame = run(conn)
+
+    if not versions:
+        warnings.warn("Query result not cached: it names no table the cache can track")
+        return frame
+    tmp = data_path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        QUERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, data_path)
+        tmp.write_text(json.dumps({"tables": versions, "query": query}, indent=2))
+        os.replace(tmp, meta_path)
+    except _CACHE_ERRORS as exc:
+        warnings.warn(f"Query result not cached: {exc}")
+        tmp.unlink(missing_ok=True)
+    return frame
+
+
+def clear_query_cache():
+    """Delete every cached query result."""
+    for path in QUERY_CACHE_DIR.glob("*"):
+        if path.suffix in (".parquet", ".json", ".tmp"):
+            path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Row decoding
+# ---------------------------------------------------------------------------
+
+def _column_array(values):
+    """One result column as a NumPy-backed array, typed the way pd.read_sql types it."""
+    col = pd.Series(np.fromiter(values, dtype=object, count=len(values)), copy=False)
+    col = col.infer_objects()
+    if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) == "decimal":
+        col = pd.to_numeric(col)  # read_sql's coerce_float
+    elif isinstance(col.dtype, pd.DatetimeTZDtype):
+        col = col.dt.tz_convert("UTC")  # read_sql normalises aware timestamps to UTC
+    return col.array
+
+
+def _decode_wkb(values):
+    """Geometry array from a column of hex EWKB text (PostGIS's default) or bytea WKB.
+
+    GEOS parses binary WKB several times faster than hex, so hex values are
+    unhexlified first (in C, via map) and decoded with one from_wkb call.
+    """
+    wkb = np.fromiter(values, dtype=object, count=len(values))
+    present = wkb != None  # noqa: E711 — elementwise None test
+    raw = wkb[present]
+    if len(raw) and isinstance(raw[0], str):
+        raw = list(map(binascii.unhexlify, raw))
+    elif len(raw) and isinstance(raw[0], memoryview):
+        raw = list(map(bytes, raw))
+    geoms = np.full(len(wkb), None, dtype=object)
+    geoms[present] = shapely.from_wkb(np.array(raw, dtype=object)) if len(raw) else []
+    return geoms
+
+
+def _rows_to_geodataframe(conn, rows, columns, geom_col, crs):
+    """Build a GeoDataFrame from DB-API rows without per-row Python work.
+
+    Rows are transposed into columns once and the geometry column is decoded
+    in bulk by ``_decode_wkb``. The result matches ``gpd.read_postgis`` for the same rows.
+    """
+    if geom_col not in columns:
+        raise ValueError(f"Query missing geometry column '{geom_col}'")
+    if columns.count(geom_col) > 1:
+        raise ValueError(f"Duplicate geometry column '{geom_col}' in query output")
+    data = dict(zip(columns, zip(*rows))) if rows else {name: () for name in columns}
+    frame = {}
+    for name in columns:
+        if name == geom_col:
+            frame[name] = _decode_wkb(data[name])
+        else:
+            frame[name] = _column_array(data[name])
+    if crs is None and rows:
+        geoms = frame[geom_col]
+        first = geoms[~shapely.is_missing(geoms)][:1]
+        srid = int(shapely.get_srid(first[0])) if len(first) else 0
+        crs = _crs_from_srid(conn, srid) if srid else None
+    return gpd.GeoDataFrame(frame, geometry=geom_col, crs=crs)
+
+
+def _crs_from_srid(conn, srid):
+    """``"auth_name:srid"`` from spatial_ref_sys, falling back to EPSG like read_postgis."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT auth_name FROM spatial_ref_sys WHERE srid = %s", (srid,))
+            row = cur.fetchone()
+    except psycopg2.Error:
+        conn.rollback()
+        row = None
+    return f"{row[0]}:{srid}" if row else f"epsg:{srid}"
+
+
+# ---------------------------------------------------------------------------
+# Query helpers
+# ---------------------------------------------------------------------------
+
+def query_to_dataframe(query, params=None, cache=False):
+    """Run a SQL query and return results as a Pandas DataFrame.
+
+    With ``cache=True`` the result is kept on disk and reused until a table
+    the query reads changes.
+    """
+    def run(conn):
+        return pd.read_sql_query(query, conn, params=params)
+
+    if cache:
+        return _cached_query("dataframe", query, params, None, None, run)
+    with session() as conn:
+        df = run(conn)
     return df
 
 
-def query_to_geodataframe(query, geom_col="geom", crs=4326, params=None):
+def query_to_geodataframe(query, geom_col="geom", crs=4326, params=None, cache=False):
     """Run a SQL query and return results as a GeoPandas GeoDataFrame.
 
     The query should return a geometry column (PostGIS native).
     gpd.read_postgis handles the WKB → Shapely conversion automatically.
+    With ``cache=True`` the result is kept on disk as GeoParquet and reused
+    until a table the query reads changes.
     """
-    conn = get_connection()
-    try:
-        gdf = gpd.read_postgis(query, conn, geom_col=geom_col, crs=crs, params=params)
-    finally:
-        conn.close()
+    def run(conn):
+        return gpd.read_postgis(query, conn, geom_col=geom_col, crs=crs, params=params)
+
+    if cache:
+        return _cached_query("geodataframe", query, params, crs, geom_col, run)
+    with session() as conn:
+        gdf = run(conn)
+    return gdf
+
+
+def query_to_geodataframe_fast(query, geom_col="geom", crs=4326, params=None, cache=False):
+    """Same result as ``query_to_geodataframe``, decoded in bulk.
+
+    ``gpd.read_postgis`` parses geometries one row at a time; this reads the
+    rows with a plain cursor, builds each attribute column as one array and
+    decodes every geometry with a single vectorised ``shapely.from_wkb`` call.
+    Much faster on large line tables. Use ``benchmark_reads.py`` to compare.
+    """
+    def run(conn):
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+            columns = [col.name for col in cur.description]
+        return _rows_to_geodataframe(conn, rows, columns, geom_col, crs)
+
+    if cache:
+        return _cached_query("geodataframe", query, params, crs, geom_col, run)
+    with session() as conn:
+        gdf = run(conn)
     return gdf
+
+
+def query_many(queries, max_workers=None, cache=False):
+    """Run several independent queries in parallel and return {name: frame}.
+
+    ``queries`` maps a name to either a SQL string, read with
+    ``query_to_geodataframe`` defaults, or a dict of its keyword arguments
+    (``query``, ``geom_col``, ``crs``, ``params``). A dict with
+    ``geom_col=None`` returns a plain DataFrame via ``query_to_dataframe``.
+
+    Each query runs on its own thread and pooled connection, at most
+    ``max_workers`` (default: the pool size) at once, so total time is
+    close to that of the slowest query. The first failing query's exception
+    is raised once all have finished.
+    """
+    def run(spec):
+        if isinstance(spec, str):
+            spec = {"query": spec}
+        spec = {"cache": cache, **spec}
+        if "geom_col" in spec and spec["geom_col"] is None:
+            return query_to_dataframe(spec["query"], spec.get("params"), spec["cache"])
+        return query_to_geodataframe(**spec)
+
+    if not queries:
+        return {}
+    workers = min(len(queries), max_workers or get_pool().maxconn)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query_many") as pool:
+        futures = {name: pool.submit(run, spec) for name, spec in queries.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def query_to_geodataframe_chunks(query, geom_col="geom", crs=4326, params=None,
+                                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """Run a SQL query and yield the results as GeoDataFrames of ``chunk_size`` rows.
+
+    Rows are fetched through a named (server-side) cursor, so only one chunk
+    is held in client memory at a time. The pooled connection stays checked
+    out until the generator is exhausted or closed.
+    """
+    with session() as conn:
+        with conn.cursor(name=f"stream_{next(_cursor_ids)}") as cur:
+            cur.itersize = chunk_size
+            cur.execute(query, params)
+            columns = None
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if columns is None:
+                    columns = [col.name for col in cur.description]
+                if not rows:
+                    break
+                yield _rows_to_geodataframe(conn, rows, columns, geom_col, crs)
+
+
+def concat_geodataframes(chunks, crs=None):
+    """Concatenate an iterable of GeoDataFrame chunks into one GeoDataFrame.
+
+    A generator such as ``query_to_geodataframe_chunks`` is only run when
+    this is called, so filters can be applied to each chunk on the way in:
+
+        concat_geodataframes(c[c.road_type == "Main Road"] for c in chunks)
+
+    Returns an empty GeoDataFrame when there are no chunks.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return gpd.GeoDataFrame(geometry=[], crs=crs)
+    return pd.concat(itertools.chain([first], chunks), ignore_index=True)
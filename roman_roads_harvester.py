@@ -17,17 +17,58 @@ Usage:
     # 2. Fetch individual segments by ID
     python roman_roads_harvester.py --mode segments --ids 31702 31703 31704
 
+    # 2b. Sweep an ID range with 8 concurrent workers (same request budget)
+    python roman_roads_harvester.py --mode segments --id-range 1 20000 --concurrency 8
+
+    # 2c. Cache responses on disk so re-runs and crash restarts skip the network
+    python roman_roads_harvester.py --mode segments --id-range 1 20000 --cache-dir ./cache/itinere
+
     # 3. Fetch individual segments and load into PostGIS
     python roman_roads_harvester.py --mode segments --ids 31702 --load-db
 
     # 4. Load previously-downloaded data into PostGIS
     python roman_roads_harvester.py --mode load --input ./data
 
+    # 4b. Refresh a few segments in place, keeping indexes, grants and views
+    python roman_roads_harvester.py --mode segments --ids 31702 31703 --load-db --db-if-exists upsert
+
+    # 4c. Nightly refresh: write only what changed since the last load
+    python roman_roads_harvester.py --mode load --input ./data --delta
+
+    # 4d. Study-area extract: filter while parsing (Balkans / Adriatic)
+    python roman_roads_harvester.py --mode load --input ./data --bbox 5.74 36.71 29.04 48.47
+
+    # 4e. Nightly delta, indexing the live tables without blocking readers
+    python roman_roads_harvester.py --mode load --input ./data --delta --index-concurrently
+
+    # 4f. Build ST_Subdivide pieces so regional bbox queries probe small boxes
+    python roman_roads_harvester.py --mode load --input ./data --subdivide --subdivide-max-vertices 32
+
     # 5. Export local files to GeoJSON / GeoPackage / Shapefile
     python roman_roads_harvester.py --mode export --input ./data --format gpkg
 
+    # 6. Parse a bulk export on 8 processes (uses orjson when installed)
+    python roman_roads_harvester.py --mode load --input ./data --workers 8
+
+    # 5b. Fast export of the full dataset via pyogrio's Arrow write path
+    python roman_roads_harvester.py --mode export --input ./data --format shp --export-engine arrow
+
+    # 6b. Re-export from the columnar snapshot written by --mode bulk (no NDJSON parse)
+    python roman_roads_harvester.py --mode export --input ./data --format gpkg
+
+    # 6c. Nightly job with per-stage metrics (and cProfile dumps per stage)
+    python roman_roads_harvester.py --mode bulk --output ./data --load-db --metrics ./data/run_metrics.json --profile ./data/profiles
+
+    # 7. Stream a large export through every sink with bounded memory
+    python roman_roads_harvester.py --mode bulk --output ./data --load-db --stream --batch-size 5000
+
+    # 7b. Hold a full in-memory parse as packed float64 vertices (far less memory)
+    python roman_roads_harvester.py --mode load --input ./data --pack-coordinates
+
 Requirements:
     pip install requests geopandas sqlalchemy geoalchemy2 psycopg2-binary shapely
+    pip install orjson  # optional, faster NDJSON parsing
+    pip install pyarrow  # optional, columnar snapshot (*.arrow) reused by load/export
 
 PostGIS connection (set env vars or use --db-url):
     export PGHOST=localhost PGPORT=5432 PGUSER=postgres PGPASSWORD=secret PGDATABASE=roman_roads
@@ -36,19 +77,34 @@ PostGIS connection (set env vars or use --db-url):
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import logging
 import os
+import queue
 import sys
+import threading
 import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    # Optional fast JSON decoder for bulk NDJSON parsing
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -67,24 +123,43 @@ SEGMENT_JSON_URL = BASE_URL + "/route-segment/{segment_id}/json"
 BULK_DOWNLOAD_URL = BASE_URL + "/route-segments/download"
 DEFAULT_OUTPUT_DIR = Path("./data/roman_roads")
 REQUEST_DELAY = 0.5  # seconds between individual segment requests (be polite)
+DEFAULT_BATCH_SIZE = 5000  # segments per sink batch in --stream mode
+NDJSON_CHUNK_BYTES = 4 * 1024 * 1024  # max bytes per parallel parse range
+MAX_RATE_LIMIT_RETRIES = 5  # 429 responses tolerated per segment in concurrent mode
+MAX_DOWNLOAD_ATTEMPTS = 5  # resumed attempts at the bulk export per run
 DEFAULT_CRS = "EPSG:4326"  # WGS 84 — native CRS of Itiner-e data
 
 # PostGIS table names
 LINES_TABLE = "roman_road_segments"
 POINTS_TABLE = "roman_road_places"
+LINKS_TABLE = "roman_road_segment_places"  # segment ↔ place, no geometry
+SUBDIVIDED_TABLE = "roman_road_segments_subdivided"  # ST_Subdivide pieces of LINES_TABLE
+SPATIAL_TABLES = (LINES_TABLE, POINTS_TABLE)
+# One row per loaded table, bumped after every load; query caches compare it
+DATA_VERSIONS_TABLE = "public.data_versions"
 
 # ---------------------------------------------------------------------------
 # HTTP Session with retry
 # ---------------------------------------------------------------------------
 
-def _build_session() -> requests.Session:
-    """Build a requests Session with automatic retries and timeout."""
+def _build_session(retry_on_429: bool = True) -> requests.Session:
+    """Build a requests Session with automatic retries and timeout.
+
+    Concurrent fetchers pass ``retry_on_429=False`` so that 429 responses reach
+    the shared rate limiter instead of being retried inside one worker thread.
+    That also turns off urllib3's own ``Retry-After`` handling, which would
+    otherwise still retry a 429 carrying the header.
+    """
     session = requests.Session()
+    status_forcelist = [500, 502, 503, 504]
+    if retry_on_429:
+        status_forcelist.insert(0, 429)
     retries = Retry(
         total=5,
         backoff_factor=1.0,
-        status_forcelist=[429, 500, 502, 503, 504],
+        status_forcelist=status_forcelist,
         allowed_methods=["GET"],
+        respect_retry_after_header=retry_on_429,
     )
     adapter = HTTPAdapter(max_retries=retries)
     session.mount("https://", adapter)
@@ -96,13 +171,202 @@ def _build_session() -> requests.Session:
     return session
 
 
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Thread-safe token bucket shared by concurrent fetch workers.
+
+    ``rate`` tokens are added per second up to ``capacity``; each request
+    consumes one. ``pause()`` blocks every worker until a server-requested
+    ``Retry-After`` window has passed.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    elapsed = now - max(self._updated, self._paused_until)
+                    self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+def _retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+def _rate_limited_get(
+    session: requests.Session,
+    url: str,
+    limiter: TokenBucket,
+    timeout: float = 30,
+) -> requests.Response:
+    """GET through a shared TokenBucket, honoring Retry-After on 429."""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        limiter.acquire()
+        resp = session.get(url, timeout=timeout)
+        if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+            return resp
+        wait = _retry_after_seconds(resp.headers.get("Retry-After"), default=2.0 ** attempt)
+        log.warning("  Rate limited (429) on %s — pausing all workers for %.1fs", url, wait)
+        limiter.pause(wait)
+    return resp
+
+
+# ---------------------------------------------------------------------------
+# On-disk response cache
+# ---------------------------------------------------------------------------
+
+class ResponseCache:
+    """Content-addressed on-disk cache for segment JSON responses.
+
+    Entries are ``<sha1(url)>.json`` files (the same naming as the top-level
+    ``cache/`` directory) holding the URL, HTTP status, fetch time and body.
+    200 responses live for ``ttl`` seconds and 404s are cached negatively for
+    ``negative_ttl``. When the directory grows past ``max_bytes`` the least
+    recently used entries (oldest mtime; hits touch the file) are evicted.
+    Safe to share between the concurrent fetch workers.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: float = 7 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        max_bytes: int = 500 * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return a fresh ``{"status", "body", ...}`` entry or None."""
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        ttl = self.ttl if entry.get("status") == 200 else self.negative_ttl
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry
+
+    def put(self, url: str, status: int, body=None):
+        """Store a 200 body or a negative (404) entry, then enforce the size cap."""
+        path = self._path(url)
+        payload = json.dumps({
+            "url": url, "status": status, "fetched_at": time.time(), "body": body,
+        })
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        with self._lock:
+            old = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self._size += len(payload.encode("utf-8")) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: Path):
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._size -= size
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of the cap (lock held)."""
+        entries = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for _, size, p in entries:
+            if self._size <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            self._size -= size
+            evicted += 1
+        log.debug("Response cache: evicted %d entries (%.1f MB kept)", evicted, self._size / 1e6)
+
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class RoadSegment:
-    """A single Itiner-e route segment (GeoJSON LineString)."""
+    """A single Itiner-e route segment (GeoJSON LineString).
+
+    ``coordinates`` is the parsed ``[[lon, lat], ...]`` list, or — only for
+    segments read by ``parse_ndjson(compact=True)`` with NumPy available — a
+    read-only ``(n, 2)`` float64 view into a shared CoordinateStore. Views
+    support ``len()``, iteration, ``[i]`` / ``[i][0]`` indexing and slicing,
+    but not in-place edits, ``json.dumps``, ``bool()`` or ``==`` against a
+    list, and integer vertices come back as floats; use ``coordinate_list()``
+    wherever a plain list is needed.
+    """
     segment_id: int
     name: str
     road_type: str
@@ -115,7 +379,7 @@ class RoadSegment:
     length_m: Optional[float]
     lower_date: Optional[int]
     upper_date: Optional[int]
-    coordinates: list  # [[lon, lat], ...] — native GeoJSON order
+    coordinates: list  # [[lon, lat], ...] — native GeoJSON order (or a CoordinateStore view)
     pleiades_places: list = field(default_factory=list)
 
     @classmethod
@@ -156,8 +420,17 @@ class RoadSegment:
             pleiades_places=places,
         )
 
+    def coordinate_list(self) -> list:
+        """The vertices as plain ``[[lon, lat], ...]`` lists, packed or not."""
+        return _coords_as_list(self.coordinates)
 
-@dataclass
+    def content_hash(self) -> str:
+        """Fingerprint of the segment's attributes and coordinates (delta sync)."""
+        return _content_hash(tuple(getattr(self, col) for col in SEGMENT_COLUMNS),
+                             _coordinate_bytes(self.coordinates))
+
+
+@dataclass(slots=True)
 class PleiadesPlace:
     """A Pleiades place (point) linked to a road segment."""
     pleiades_id: int
@@ -169,25 +442,164 @@ class PleiadesPlace:
     lon: Optional[float]
     lat: Optional[float]
 
+    def content_hash(self) -> str:
+        """Fingerprint of the place's attributes and location (delta sync)."""
+        return _content_hash(tuple(getattr(self, col) for col in PLACE_COLUMNS),
+                             _coordinate_bytes([[self.lon, self.lat]]))
+
+
+def _content_hash(values: tuple, coordinate_bytes: bytes) -> str:
+    """SHA1 of the attribute values (``repr``, in column order) + packed float64 vertices."""
+    return hashlib.sha1(repr(values).encode("utf-8") + b"|" + coordinate_bytes).hexdigest()
+
+
+def _coordinate_bytes(coordinates) -> bytes:
+    """Vertices as native float64 bytes, the layout of a CoordinateStore buffer,
+    so list and packed coordinates hash alike."""
+    if hasattr(coordinates, "tobytes"):
+        return coordinates.astype("float64", copy=False).tobytes()
+    return array("d", [float(c) for pt in coordinates for c in pt]).tobytes()
+
+
+def _coords_as_list(coordinates) -> list:
+    """Plain ``[[lon, lat], ...]`` lists from a list or a CoordinateStore view."""
+    if hasattr(coordinates, "tolist"):
+        return coordinates.tolist()
+    return coordinates
+
+
+class CoordinateStore:
+    """Ragged array of segment vertices in one contiguous float64 buffer.
+
+    ``coords`` is an ``(n_vertices, 2)`` array of lon/lat and ``offsets`` an
+    ``(n_segments + 1,)`` index array, so segment ``i`` owns
+    ``coords[offsets[i]:offsets[i + 1]]``. Compared to lists of ``[lon, lat]``
+    lists this removes the per-vertex Python object overhead, and shapely
+    geometries can be built from the buffer in one vectorized call.
+    """
+
+    def __init__(self, coords, offsets):
+        self.coords = coords
+        self.offsets = offsets
+
+    @classmethod
+    def from_segments(cls, segments: list[RoadSegment], attach: bool = True) -> "CoordinateStore":
+        """Pack the coordinates of ``segments`` into a single buffer.
+
+        With ``attach`` each ``seg.coordinates`` is replaced by a read-only
+        ``(n, 2)`` NumPy view into the shared buffer, which supports ``len()``,
+        iteration and indexing but is not a list (see ``RoadSegment``).
+        """
+        import numpy as np
+        from itertools import chain
+
+        counts = np.fromiter((len(seg.coordinates) for seg in segments), dtype=np.int64,
+                             count=len(segments))
+        offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        if all(isinstance(seg.coordinates, np.ndarray) for seg in segments) and len(segments):
+            coords = np.concatenate([seg.coordinates for seg in segments]).astype(np.float64, copy=False)
+        else:
+            flat = chain.from_iterable(
+                (pt[0], pt[1]) for seg in segments for pt in seg.coordinates
+            )
+            coords = np.fromiter(flat, dtype=np.float64, count=2 * int(offsets[-1]))
+        coords = coords.reshape(-1, 2)
+        coords.flags.writeable = False
+
+        store = cls(coords, offsets)
+        if attach:
+            for i, seg in enumerate(segments):
+                seg.coordinates = store[i]
+        return store
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int):
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    def counts(self):
+        """Number of vertices per segment."""
+        import numpy as np
+        return np.diff(self.offsets)
+
+    def linestrings(self, min_vertices: int = 2):
+        """Build shapely LineStrings for every segment in one call.
+
+        Returns ``(geometries, mask)`` where ``mask`` flags the segments with at
+        least ``min_vertices`` vertices, i.e. those that have a geometry.
+        """
+        import numpy as np
+        import shapely
+
+        counts = self.counts()
+        mask = counts >= min_vertices
+        keep = np.repeat(mask, counts)
+        indices = np.repeat(np.arange(mask.sum()), counts[mask])
+        if not len(indices):
+            return np.empty(0, dtype=object), mask
+        return shapely.linestrings(self.coords[keep], indices=indices), mask
+
 
 # ---------------------------------------------------------------------------
 # Fetchers
 # ---------------------------------------------------------------------------
 
-def fetch_segment(session: requests.Session, segment_id: int) -> Optional[RoadSegment]:
-    """Fetch a single route segment by ID."""
+def fetch_segment(
+    session: requests.Session,
+    segment_id: int,
+    limiter: Optional[TokenBucket] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Optional[RoadSegment]:
+    """Fetch a single route segment by ID.
+
+    When ``limiter`` is given the request waits for a token from the shared
+    bucket and 429 responses pause the bucket for the ``Retry-After`` window.
+    A ``cache`` hit (including a cached 404) skips the network entirely.
+    """
+    return _fetch_segment(session, segment_id, limiter, cache)[0]
+
+
+def _fetch_segment(
+    session: requests.Session,
+    segment_id: int,
+    limiter: Optional[TokenBucket] = None,
+    cache: Optional[ResponseCache] = None,
+) -> tuple[Optional[RoadSegment], bool]:
+    """``fetch_segment`` plus whether the answer came from the cache."""
     url = SEGMENT_JSON_URL.format(segment_id=segment_id)
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None:
+        if entry["status"] == 404:
+            log.warning("  Segment %d not found (cached 404), skipping.", segment_id)
+            return None, True
+        try:
+            seg = RoadSegment.from_json(entry["body"])
+            log.info("Segment %d from cache — %s", segment_id, seg.name)
+            return seg, True
+        except Exception as e:
+            log.warning("  Unreadable cache entry for segment %d (%s); refetching.", segment_id, e)
+
     log.info("Fetching segment %d ...", segment_id)
     try:
-        resp = session.get(url, timeout=30)
+        if limiter is not None:
+            resp = _rate_limited_get(session, url, limiter)
+        else:
+            resp = session.get(url, timeout=30)
+        if resp.status_code == 404 and cache is not None:
+            cache.put(url, 404)
         resp.raise_for_status()
         data = resp.json()
         seg = RoadSegment.from_json(data)
+        if cache is not None:
+            cache.put(url, 200, data)
         log.info(
             "  ✓ %s — %d coords, %d places",
             seg.name, len(seg.coordinates), len(seg.pleiades_places),
         )
-        return seg
+        return seg, False
     except requests.exceptions.HTTPError as e:
         if e.response is not None and e.response.status_code == 404:
             log.warning("  Segment %d not found (404), skipping.", segment_id)
@@ -195,144 +607,981 @@ def fetch_segment(session: requests.Session, segment_id: int) -> Optional[RoadSe
             log.error("  HTTP error fetching segment %d: %s", segment_id, e)
     except Exception as e:
         log.error("  Error fetching segment %d: %s", segment_id, e)
-    return None
+    return None, False
+
+
+def fetch_segments(
+    segment_ids: list[int],
+    delay: float = REQUEST_DELAY,
+    concurrency: int = 1,
+    cache: Optional[ResponseCache] = None,
+) -> list[RoadSegment]:
+    """Fetch multiple segments by ID with polite delay.
+
+    With ``concurrency > 1`` requests are spread over a thread pool that shares
+    one TokenBucket refilled at ``1 / delay`` requests per second, so the total
+    request rate stays within the same budget while network latency overlaps.
+    Results are returned in the order of ``segment_ids``. Segments served from
+    ``cache`` cost no request and no delay.
+    """
+    if concurrency > 1:
+        return _fetch_segments_concurrent(segment_ids, delay, concurrency, cache)
 
-
-def fetch_segments(segment_ids: list[int], delay: float = REQUEST_DELAY) -> list[RoadSegment]:
-    """Fetch multiple segments by ID with polite delay."""
     session = _build_session()
     segments = []
     for i, sid in enumerate(segment_ids):
-        seg = fetch_segment(session, sid)
+        seg, cached = _fetch_segment(session, sid, cache=cache)
         if seg:
             segments.append(seg)
-        if i < len(segment_ids) - 1:
+        if not cached and i < len(segment_ids) - 1:
             time.sleep(delay)
     log.info("Fetched %d / %d segments successfully.", len(segments), len(segment_ids))
     return segments
 
 
-def download_bulk_export(output_dir: Path) -> Path:
-    """Download the nightly NDJSON bulk export of all route segments."""
+def _fetch_segments_concurrent(
+    segment_ids: list[int],
+    delay: float,
+    concurrency: int,
+    cache: Optional[ResponseCache] = None,
+) -> list[RoadSegment]:
+    """Thread-pool implementation behind ``fetch_segments(concurrency > 1)``."""
+    limiter = TokenBucket(rate=1.0 / delay) if delay > 0 else None
+    local = threading.local()
+
+    def worker(sid: int) -> Optional[RoadSegment]:
+        # requests.Session is not guaranteed thread-safe: one per worker thread
+        if not hasattr(local, "session"):
+            local.session = _build_session(retry_on_429=limiter is None)
+        return fetch_segment(local.session, sid, limiter=limiter, cache=cache)
+
+    log.info(
+        "Fetching %d segments with %d workers (≤ %s req/s) ...",
+        len(segment_ids), concurrency,
+        f"{1.0 / delay:.2f}" if delay > 0 else "unlimited",
+    )
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        segments = [seg for seg in pool.map(worker, segment_ids) if seg]
+    log.info("Fetched %d / %d segments successfully.", len(segments), len(segment_ids))
+    return segments
+
+
+def _meta_path(path: Path) -> Path:
+    """Sidecar file holding the HTTP validators for a downloaded file."""
+    return path.with_name(path.name + ".meta.json")
+
+
+def _read_meta(path: Path) -> dict:
+    try:
+        with open(_meta_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(path: Path, meta: dict):
+    with open(_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _validators(resp: requests.Response) -> dict:
+    """ETag / Last-Modified / total size of a 200 or 206 response."""
+    total = resp.headers.get("Content-Length")
+    content_range = resp.headers.get("Content-Range", "")
+    if resp.status_code == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+    return {
+        "url": BULK_DOWNLOAD_URL,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "content_length": int(total) if total and total.isdigit() else None,
+    }
+
+
+def download_bulk_export(output_dir: Path, force: bool = False) -> tuple[Path, bool]:
+    """Download the nightly NDJSON bulk export of all route segments.
+
+    The ETag / Last-Modified of the last complete download are kept next to
+    the export (``itinere_all_segments.ndjson.meta.json``) and sent back as
+    conditional headers, so an unchanged export costs a single 304. Data is
+    streamed into a ``.part`` file that is resumed with an HTTP Range request
+    after a dropped connection and atomically renamed once complete.
+
+    Returns ``(path, changed)``; ``changed`` is False when the server
+    answered 304 Not Modified. ``force`` skips the conditional headers.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
     out_path = output_dir / "itinere_all_segments.ndjson"
+    part_path = output_dir / (out_path.name + ".part")
 
     log.info("Downloading bulk export from %s ...", BULK_DOWNLOAD_URL)
     session = _build_session()
-    resp = session.get(BULK_DOWNLOAD_URL, timeout=300, stream=True)
-    resp.raise_for_status()
 
-    total = 0
-    with open(out_path, "wb") as f:
-        for chunk in resp.iter_content(chunk_size=1024 * 256):
-            f.write(chunk)
-            total += len(chunk)
-    log.info("  ✓ Downloaded %.2f MB → %s", total / 1e6, out_path)
-    return out_path
+    for attempt in range(1, MAX_DOWNLOAD_ATTEMPTS + 1):
+        # Range offsets count bytes of the representation sent; a compressed
+        # response would be stored decoded in .part and resumed at the wrong
+        # offset, so ask for the raw bytes
+        headers = {"Accept-Encoding": "identity"}
+        part_meta = _read_meta(part_path) if part_path.exists() else {}
+        offset = part_path.stat().st_size if part_meta else 0
+        # If-Range needs a strong validator; weak ETags fall back to the date
+        if_range = part_meta.get("etag") or part_meta.get("last_modified")
+        if if_range and if_range.startswith("W/"):
+            if_range = part_meta.get("last_modified")
+        if offset and if_range:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = if_range
+        elif out_path.exists() and not force:
+            meta = _read_meta(out_path)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = session.get(BULK_DOWNLOAD_URL, headers=headers, timeout=300, stream=True)
+        if resp.status_code == 304:
+            log.info("  ✓ Bulk export unchanged since last download (304) → %s", out_path)
+            return out_path, False
+        if resp.status_code == 416:
+            # Stale partial file the server can no longer extend — start over
+            log.warning("  Partial download rejected (416); restarting from scratch.")
+            part_path.unlink(missing_ok=True)
+            _meta_path(part_path).unlink(missing_ok=True)
+            continue
+        resp.raise_for_status()
 
+        resumed = resp.status_code == 206
+        if resumed:
+            log.info("  Resuming partial download at %.2f MB ...", offset / 1e6)
+        else:
+            offset = 0
+            _write_meta(part_path, _validators(resp))
+
+        total = offset
+        try:
+            with open(part_path, "ab" if resumed else "wb") as f:
+                for chunk in resp.iter_content(chunk_size=1024 * 256):
+                    f.write(chunk)
+                    total += len(chunk)
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout) as e:
+            log.warning(
+                "  Download interrupted at %.2f MB (attempt %d/%d): %s",
+                total / 1e6, attempt, MAX_DOWNLOAD_ATTEMPTS, e,
+            )
+            continue
 
-def parse_ndjson(filepath: Path) -> list[RoadSegment]:
-    """Parse an NDJSON file into RoadSegment objects."""
-    segments = []
+        meta = _read_meta(part_path)
+        expected = meta.get("content_length")
+        if expected and total < expected:
+            log.warning("  Download ended early (%d / %d bytes); resuming.", total, expected)
+            continue
+
+        os.replace(part_path, out_path)
+        os.replace(_meta_path(part_path), _meta_path(out_path))
+        log.info("  ✓ Downloaded %.2f MB → %s", total / 1e6, out_path)
+        return out_path, True
+
+    raise RuntimeError(
+        f"Bulk download failed after {MAX_DOWNLOAD_ATTEMPTS} attempts; "
+        f"partial data kept in {part_path} for the next run."
+    )
+
+
+@dataclass(frozen=True)
+class SegmentFilter:
+    """Parse-time filters applied to raw Itiner-e JSON before a RoadSegment is built.
+
+    ``bbox`` is ``(west, south, east, north)`` in EPSG:4326; a segment is kept
+    when its coordinate extent intersects it, and its linked places are
+    trimmed to those inside it. ``road_types`` / ``certainties`` match the
+    ``type`` / ``segmentCertainty`` properties, and ``date_range`` keeps
+    segments whose ``lowerDate``–``upperDate`` span overlaps ``(start, end)``
+    (a missing bound counts as open).
+    """
+    bbox: Optional[tuple[float, float, float, float]] = None
+    road_types: Optional[frozenset] = None
+    certainties: Optional[frozenset] = None
+    date_range: Optional[tuple[int, int]] = None
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Optional["SegmentFilter"]:
+        """Build a filter from CLI arguments, or None when none were given."""
+        filt = cls(
+            bbox=tuple(args.bbox) if args.bbox else None,
+            road_types=frozenset(args.road_type) if args.road_type else None,
+            certainties=frozenset(args.certainty) if args.certainty else None,
+            date_range=tuple(args.date_range) if args.date_range else None,
+        )
+        return filt if filt != cls() else None
+
+    def apply(self, data: dict) -> Optional[dict]:
+        """Return ``data`` (places trimmed to the bbox) if it passes, else None."""
+        props = data.get("properties", {})
+        if self.road_types is not None and props.get("type", "Unknown") not in self.road_types:
+            return None
+        if (self.certainties is not None
+                and props.get("segmentCertainty", "Unknown") not in self.certainties):
+            return None
+        if self.date_range is not None:
+            start, end = self.date_range
+            lower, upper = props.get("lowerDate"), props.get("upperDate")
+            if (lower is not None and lower > end) or (upper is not None and upper < start):
+                return None
+        if self.bbox is not None:
+            coords = data.get("geometry", {}).get("coordinates", [])
+            if not coords:
+                return None
+            west, south, east, north = self.bbox
+            lons = [pt[0] for pt in coords]
+            lats = [pt[1] for pt in coords]
+            if min(lons) > east or max(lons) < west or min(lats) > north or max(lats) < south:
+                return None
+            data["pleiadesPlaces"] = [
+                p for p in data.get("pleiadesPlaces", [])
+                if self._contains(p.get("geometry", {}).get("coordinates"))
+            ]
+        return data
+
+    def _contains(self, point) -> bool:
+        if not point or point[0] is None or point[1] is None:
+            return False
+        west, south, east, north = self.bbox
+        return west <= point[0] <= east and south <= point[1] <= north
+
+
+def iter_ndjson(
+    filepath: Path,
+    workers: int = 1,
+    filters: Optional[SegmentFilter] = None,
+) -> Iterator[RoadSegment]:
+    """Lazily parse an NDJSON file, yielding one RoadSegment per valid line.
+
+    With ``workers > 1`` the file is split into newline-aligned byte ranges
+    that are parsed in a process pool; segments are still yielded in file
+    order and error reporting is identical to the sequential path.
+    ``filters`` drops non-matching lines before a RoadSegment is built.
+    """
+    if workers > 1:
+        yield from _iter_ndjson_parallel(filepath, workers, filters)
+        return
+
+    count = 0
     errors = 0
-    with open(filepath, "r", encoding="utf-8") as f:
+    rejected = 0
+    with open(filepath, "rb") as f:
         for lineno, line in enumerate(f, start=1):
             line = line.strip()
             if not line:
                 continue
             try:
-                data = json.loads(line)
-                segments.append(RoadSegment.from_json(data))
+                data = _json_loads(line)
+                if filters is not None:
+                    data = filters.apply(data)
+                    if data is None:
+                        rejected += 1
+                        continue
+                seg = RoadSegment.from_json(data)
             except Exception as e:
                 errors += 1
                 if errors <= 10:
                     log.warning("  Parse error on line %d: %s", lineno, e)
-    log.info("Parsed %d segments (%d errors) from %s", len(segments), errors, filepath.name)
+                continue
+            count += 1
+            yield seg
+    log.info("Parsed %d segments (%d errors) from %s", count, errors, filepath.name)
+    if filters is not None:
+        log.info("  %d segments rejected by filters", rejected)
+
+
+def parse_ndjson(
+    filepath: Path,
+    workers: int = 1,
+    filters: Optional[SegmentFilter] = None,
+    compact: bool = False,
+) -> list[RoadSegment]:
+    """Parse an NDJSON file into RoadSegment objects.
+
+    With ``compact`` (and NumPy importable) the vertices of every
+    ``DEFAULT_BATCH_SIZE`` segments are packed into a CoordinateStore as
+    soon as they are parsed, so the per-vertex lists are freed as parsing
+    goes rather than all coexisting with the packed buffer. Off by default:
+    packed ``seg.coordinates`` are read-only float arrays, not lists (see
+    ``RoadSegment``).
+    """
+    segments: list[RoadSegment] = []
+    for batch in _batched(iter_ndjson(filepath, workers=workers, filters=filters),
+                          DEFAULT_BATCH_SIZE):
+        if compact:
+            compact = _compact_coordinates(batch)
+        segments.extend(batch)
     return segments
 
 
+def _ndjson_byte_ranges(filepath: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split a file into byte ranges of about ``chunk_bytes`` that start on line boundaries."""
+    size = filepath.stat().st_size
+    bounds = [0]
+    with open(filepath, "rb") as f:
+        while True:
+            f.seek(bounds[-1] + chunk_bytes)
+            f.readline()  # advance to the start of the next full line
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_ndjson_range(
+    filepath: Path,
+    start: int,
+    end: int,
+    filters: Optional[SegmentFilter] = None,
+):
+    """Process-pool worker: parse the lines in ``[start, end)`` of a file.
+
+    Returns ``(segments, n_lines, errors, n_errors, n_rejected)`` where
+    ``errors`` holds at most the first 10 ``(line_offset, message)`` pairs.
+    """
+    segments = []
+    errors = []
+    n_errors = 0
+    n_rejected = 0
+    n_lines = 0
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            n_lines += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = _json_loads(line)
+                if filters is not None:
+                    data = filters.apply(data)
+                    if data is None:
+                        n_rejected += 1
+                        continue
+                segments.append(RoadSegment.from_json(data))
+            except Exception as e:
+                n_errors += 1
+                if len(errors) < 10:
+                    errors.append((n_lines, str(e)))
+    return segments, n_lines, errors, n_errors, n_rejected
+
+
+def _iter_ndjson_parallel(
+    filepath: Path,
+    workers: int,
+    filters: Optional[SegmentFilter] = None,
+) -> Iterator[RoadSegment]:
+    """Process-pool implementation behind ``iter_ndjson(workers > 1)``."""
+    # Ranges are capped in bytes, not taken as a fraction of the file, so the
+    # window of in-flight ranges buffers at most workers * 2 * NDJSON_CHUNK_BYTES
+    # of input however large the export; small files still get several
+    # ranges per worker to balance load.
+    size = filepath.stat().st_size
+    chunk_bytes = max(1, min(NDJSON_CHUNK_BYTES, -(-size // (workers * 4))))
+    ranges = _ndjson_byte_ranges(filepath, chunk_bytes)
+    count = 0
+    errors = 0
+    rejected = 0
+    line_offset = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        remaining = iter(ranges)
+
+        def submit_next():
+            rng = next(remaining, None)
+            if rng is not None:
+                pending.append(pool.submit(_parse_ndjson_range, filepath, *rng, filters))
+
+        for _ in range(workers * 2):
+            submit_next()
+        while pending:
+            segments, n_lines, chunk_errors, n_errors, n_rejected = pending.popleft().result()
+            submit_next()
+            for local_lineno, message in chunk_errors:
+                errors += 1
+                if errors <= 10:
+                    log.warning("  Parse error on line %d: %s", line_offset + local_lineno, message)
+            errors += n_errors - len(chunk_errors)
+            line_offset += n_lines
+            rejected += n_rejected
+            count += len(segments)
+            yield from segments
+    log.info("Parsed %d segments (%d errors) from %s", count, errors, filepath.name)
+    if filters is not None:
+        log.info("  %d segments rejected by filters", rejected)
+
+
+class NDJSONSource:
+    """Re-iterable, lazily parsed view over one or more NDJSON files.
+
+    Each iteration re-reads the files, so several sinks (save, export, load)
+    can consume the same input without ever holding it all in memory.
+    ``count`` holds the number of segments yielded by the last full pass.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        workers: int = 1,
+        filters: Optional[SegmentFilter] = None,
+    ):
+        self.paths = list(paths)
+        self.workers = workers
+        self.filters = filters
+        self.count = 0
+
+    def __iter__(self) -> Iterator[RoadSegment]:
+        count = 0
+        for path in self.paths:
+            for seg in iter_ndjson(path, workers=self.workers, filters=self.filters):
+                count += 1
+                yield seg
+        self.count = count
+
+    def __bool__(self) -> bool:
+        for path in self.paths:
+            with open(path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        data = _json_loads(line)
+                        if self.filters is not None:
+                            data = self.filters.apply(data)
+                            if data is None:
+                                continue
+                        RoadSegment.from_json(data)
+                        return True
+                    except Exception:
+                        continue
+        return False
+
+
+def _batched(segments: Iterable[RoadSegment], batch_size: Optional[int]) -> Iterator[list[RoadSegment]]:
+    """Yield lists of at most ``batch_size`` segments (one list when None)."""
+    if batch_size is None:
+        yield segments if isinstance(segments, list) else list(segments)
+        return
+    batch = []
+    for seg in segments:
+        batch.append(seg)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Feature records (shared by every sink)
+# ---------------------------------------------------------------------------
+
+def _segment_properties(seg: RoadSegment) -> dict:
+    """Attribute columns for a road segment line feature."""
+    return {
+        "segment_id": seg.segment_id,
+        "name": seg.name,
+        "road_type": seg.road_type,
+        "segment_certainty": seg.segment_certainty,
+        "construction_period": seg.construction_period,
+        "itinerary": seg.itinerary,
+        "author": seg.author,
+        "bibliography": seg.bibliography,
+        "description": seg.description,
+        "length_m": seg.length_m,
+        "lower_date": seg.lower_date,
+        "upper_date": seg.upper_date,
+        "source_url": f"{BASE_URL}/route-segment/{seg.segment_id}",
+    }
+
+
+def _place_properties(pl: PleiadesPlace) -> dict:
+    """Attribute columns for a Pleiades place point feature."""
+    return {
+        "pleiades_id": pl.pleiades_id,
+        "name": pl.name,
+        "place_type": pl.place_type,
+        "start_year": pl.start_year,
+        "end_year": pl.end_year,
+        "url": pl.url,
+    }
+
+
+def _new_places(segments: Iterable[RoadSegment], seen_ids: set) -> Iterator[PleiadesPlace]:
+    """Yield located places not yet in ``seen_ids`` (updated in place)."""
+    for seg in segments:
+        for pl in seg.pleiades_places:
+            if pl.pleiades_id in seen_ids or pl.lon is None or pl.lat is None:
+                continue
+            seen_ids.add(pl.pleiades_id)
+            yield pl
+
+
 # ---------------------------------------------------------------------------
 # Save to local GeoJSON files
 # ---------------------------------------------------------------------------
 
-def save_geojson(segments: list[RoadSegment], output_dir: Path):
-    """Save segments and places as GeoJSON files (no geopandas needed)."""
-    output_dir.mkdir(parents=True, exist_ok=True)
+class GeoJSONWriter:
+    """Incremental writer for a GeoJSON FeatureCollection.
+
+    The header is written on open, features are serialized one at a time
+    into a small buffer that is flushed every ``buffer_size`` features, and
+    the array is closed on exit — memory use does not depend on file size.
+    Output goes to ``<path>.part``, which replaces ``path`` only when the
+    block exits cleanly, so a failed run leaves the previous file intact.
+
+    ``precision`` rounds coordinates to that many decimal places (6 ≈ 0.1 m)
+    and ``compact`` drops the whitespace after separators.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        precision: Optional[int] = None,
+        compact: bool = False,
+        buffer_size: int = 1000,
+    ):
+        self.path = path
+        self.precision = precision
+        self.separators = (",", ":") if compact else (", ", ": ")
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer: list[str] = []
+        self._file = None
+        self._part = None
+
+    def __enter__(self) -> "GeoJSONWriter":
+        self._part = self.path.with_name(self.path.name + ".part")
+        self._file = open(self._part, "w", encoding="utf-8")
+        item_sep, key_sep = self.separators
+        self._file.write(
+            f'{{"type"{key_sep}"FeatureCollection"{item_sep}"features"{key_sep}['
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._flush()
+                self._file.write("]}")
+        finally:
+            self._file.close()
+        if exc_type is None:
+            os.replace(self._part, self.path)
+        else:
+            self._part.unlink(missing_ok=True)
 
-    # --- Lines ---
-    line_features = []
-    for seg in segments:
+    def write(self, properties: dict, geom_type: str, coordinates):
+        """Serialize one feature (coordinates as lists or a NumPy array)."""
+        coordinates = self._round(coordinates)
         feat = {
             "type": "Feature",
-            "properties": {
-                "segment_id": seg.segment_id,
-                "name": seg.name,
-                "road_type": seg.road_type,
-                "segment_certainty": seg.segment_certainty,
-                "construction_period": seg.construction_period,
-                "itinerary": seg.itinerary,
-                "author": seg.author,
-                "bibliography": seg.bibliography,
-                "description": seg.description,
-                "length_m": seg.length_m,
-                "lower_date": seg.lower_date,
-                "upper_date": seg.upper_date,
-                "source_url": f"{BASE_URL}/route-segment/{seg.segment_id}",
-            },
-            "geometry": {
-                "type": "LineString",
-                "coordinates": seg.coordinates,
-            },
+            "properties": properties,
+            "geometry": {"type": geom_type, "coordinates": coordinates},
         }
-        line_features.append(feat)
+        prefix = self.separators[0] if self.count else ""
+        self._buffer.append(prefix + json.dumps(feat, separators=self.separators))
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _round(self, coordinates):
+        if hasattr(coordinates, "round"):
+            if self.precision is not None:
+                coordinates = coordinates.round(self.precision)
+            return coordinates.tolist()
+        if self.precision is None:
+            return coordinates
+        return _round_coords(coordinates, self.precision)
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+
+
+def _round_coords(coordinates, precision: int):
+    """Round a (nested) GeoJSON coordinate list, leaving None untouched."""
+    if isinstance(coordinates, (list, tuple)):
+        return [_round_coords(c, precision) for c in coordinates]
+    if coordinates is None:
+        return None
+    return round(coordinates, precision)
+
+
+def save_geojson(
+    segments: Iterable[RoadSegment],
+    output_dir: Path,
+    batch_size: Optional[int] = None,
+    precision: Optional[int] = None,
+    compact: bool = False,
+):
+    """Save segments and places as GeoJSON files (no geopandas needed).
 
+    Features are streamed to disk through ``GeoJSONWriter`` as they arrive, so
+    ``segments`` may be a generator and only ``batch_size`` segments are held
+    in memory at once. ``precision`` and ``compact`` shrink the output files.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
     lines_path = output_dir / "roman_road_segments.geojson"
-    with open(lines_path, "w", encoding="utf-8") as f:
-        json.dump({"type": "FeatureCollection", "features": line_features}, f)
-    log.info("Saved %d line features → %s", len(line_features), lines_path)
+    points_path = output_dir / "roman_road_places.geojson"
 
-    # --- Points (deduplicated) ---
     seen_ids = set()
-    point_features = []
-    for seg in segments:
-        for pl in seg.pleiades_places:
-            if pl.pleiades_id in seen_ids or pl.lon is None or pl.lat is None:
+    options = {"precision": precision, "compact": compact}
+    with GeoJSONWriter(lines_path, **options) as lines, \
+            GeoJSONWriter(points_path, **options) as points:
+        for batch in _batched(segments, batch_size):
+            for seg in batch:
+                lines.write(_segment_properties(seg), "LineString", seg.coordinates)
+            # Points are deduplicated across batches
+            for pl in _new_places(batch, seen_ids):
+                points.write(_place_properties(pl), "Point", [pl.lon, pl.lat])
+
+    log.info("Saved %d line features → %s", lines.count, lines_path)
+    log.info("Saved %d point features → %s", points.count, points_path)
+    return lines_path, points_path
+
+
+# ---------------------------------------------------------------------------
+# GeoDataFrame builder (shared by export and PostGIS load)
+# ---------------------------------------------------------------------------
+
+SEGMENT_COLUMNS = (
+    "segment_id", "name", "road_type", "segment_certainty", "construction_period",
+    "itinerary", "author", "bibliography", "description", "length_m",
+    "lower_date", "upper_date",
+)
+PLACE_COLUMNS = ("pleiades_id", "name", "place_type", "start_year", "end_year", "url")
+
+
+@dataclass
+class SegmentFrames:
+    """Line and (deduplicated) point GeoDataFrames built from one segment list,
+    plus the segment–place link rows (``segment_id``, ``pleiades_id``)."""
+    lines: "gpd.GeoDataFrame"
+    points: "gpd.GeoDataFrame"
+    segment_count: int = 0
+    links: Optional["pd.DataFrame"] = None
+
+    def __len__(self) -> int:
+        return self.segment_count
+
+
+def build_geodataframes(
+    segments: list[RoadSegment],
+    seen_ids: Optional[set] = None,
+) -> SegmentFrames:
+    """Build the lines and points GeoDataFrames in a single columnar pass.
+
+    Attribute columns are collected straight into per-column lists, all line
+    geometries come from one ``shapely.linestrings`` call over a packed
+    CoordinateStore and all points from one ``shapely.points`` call. Both
+    frames carry a ``content_hash`` column (used by the PostGIS delta sync),
+    hashed from the attribute columns and slices of the packed float64 vertex
+    buffer rather than from per-segment JSON coordinate lists.
+    ``links`` keeps every segment's places (in listed order) — including
+    places already emitted by an earlier batch — so the relationship survives
+    the point deduplication.
+
+    ``seen_ids`` carries place deduplication across batches and is updated in
+    place.
+    """
+    if seen_ids is None:
+        seen_ids = set()
+
+    import geopandas as gpd
+    import numpy as np
+    import pandas as pd
+    import shapely
+
+    # --- Lines: one vectorized geometry call over the packed vertex buffer ---
+    store = CoordinateStore.from_segments(segments, attach=False)
+    geoms, has_geom = store.linestrings()
+    kept = [seg for seg, keep in zip(segments, has_geom) if keep]
+    # One attribute tuple per segment: transposed into columns and hashed as is
+    rows = list(map(attrgetter(*SEGMENT_COLUMNS), kept))
+    columns = list(zip(*rows)) or [()] * len(SEGMENT_COLUMNS)
+    line_cols = {col: list(values) for col, values in zip(SEGMENT_COLUMNS, columns)}
+    line_cols["source_url"] = [f"{BASE_URL}/route-segment/{seg.segment_id}" for seg in kept]
+    buffer = store.coords.tobytes()
+    bounds = (store.offsets * store.coords.itemsize * 2).tolist()
+    line_cols["content_hash"] = [
+        _content_hash(values, buffer[bounds[i]:bounds[i + 1]])
+        for i, values in zip(np.flatnonzero(has_geom).tolist(), rows)
+    ]
+    gdf_lines = gpd.GeoDataFrame(line_cols, geometry=geoms, crs=DEFAULT_CRS)
+
+    # --- Points: deduplicated by pleiades_id, built from lon/lat arrays ---
+    places = list(_new_places(segments, seen_ids))
+    rows = list(map(attrgetter(*PLACE_COLUMNS), places))
+    columns = list(zip(*rows)) or [()] * len(PLACE_COLUMNS)
+    point_cols = {col: list(values) for col, values in zip(PLACE_COLUMNS, columns)}
+    lon = np.fromiter((pl.lon for pl in places), dtype=np.float64, count=len(places))
+    lat = np.fromiter((pl.lat for pl in places), dtype=np.float64, count=len(places))
+    buffer = np.column_stack((lon, lat)).tobytes()
+    point_cols["content_hash"] = [
+        _content_hash(values, buffer[16 * i:16 * i + 16])
+        for i, values in enumerate(rows)
+    ]
+    gdf_points = gpd.GeoDataFrame(point_cols, geometry=shapely.points(lon, lat), crs=DEFAULT_CRS)
+
+    # --- Links: one row per (segment, located place), in listed order ---
+    link_cols = {"segment_id": [], "pleiades_id": [], "place_order": []}
+    for seg in kept:
+        linked = set()
+        for order, pl in enumerate(seg.pleiades_places):
+            if pl.pleiades_id in linked or pl.lon is None or pl.lat is None:
                 continue
-            seen_ids.add(pl.pleiades_id)
-            feat = {
-                "type": "Feature",
-                "properties": {
-                    "pleiades_id": pl.pleiades_id,
-                    "name": pl.name,
-                    "place_type": pl.place_type,
-                    "start_year": pl.start_year,
-                    "end_year": pl.end_year,
-                    "url": pl.url,
-                },
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [pl.lon, pl.lat],
-                },
-            }
-            point_features.append(feat)
+            linked.add(pl.pleiades_id)
+            link_cols["segment_id"].append(seg.segment_id)
+            link_cols["pleiades_id"].append(pl.pleiades_id)
+            link_cols["place_order"].append(order)
+    links = pd.DataFrame(link_cols, dtype="Int64")
 
-    points_path = output_dir / "roman_road_places.geojson"
-    with open(points_path, "w", encoding="utf-8") as f:
-        json.dump({"type": "FeatureCollection", "features": point_features}, f)
-    log.info("Saved %d point features → %s", len(point_features), points_path)
+    return SegmentFrames(gdf_lines, gdf_points, segment_count=len(segments), links=links)
 
-    return lines_path, points_path
+
+def _frame_tables(frames: SegmentFrames) -> list[tuple]:
+    """``(table, frame)`` pairs for every table a SegmentFrames feeds."""
+    pairs = [(LINES_TABLE, frames.lines), (POINTS_TABLE, frames.points)]
+    if frames.links is not None:
+        pairs.append((LINKS_TABLE, frames.links))
+    return pairs
+
+
+def _iter_frames(segments, batch_size: Optional[int]) -> Iterator[SegmentFrames]:
+    """Yield SegmentFrames per batch; prebuilt frames pass through whole and a
+    SnapshotSource is sliced into ``batch_size`` frames."""
+    if isinstance(segments, SegmentFrames):
+        yield segments
+        return
+    if isinstance(segments, SnapshotSource):
+        yield from segments.frames(batch_size)
+        return
+    seen_ids = set()
+    for batch in _batched(segments, batch_size):
+        yield build_geodataframes(batch, seen_ids)
+
+
+# ---------------------------------------------------------------------------
+# Columnar snapshot (Arrow IPC, memory-mappable)
+# ---------------------------------------------------------------------------
+
+SNAPSHOT_FILES = {
+    LINES_TABLE: "roman_road_segments.arrow",
+    POINTS_TABLE: "roman_road_places.arrow",
+    LINKS_TABLE: "roman_road_segment_places.arrow",
+}
+
+
+def _snapshot_schema(table: str):
+    """Fixed Arrow schema (plus GeoParquet-style ``geo`` metadata) for a snapshot."""
+    import pyarrow as pa
+    from pyproj import CRS
+
+    arrow_types = {
+        "bigint": pa.int64(),
+        "integer": pa.int64(),
+        "text": pa.string(),
+        "double precision": pa.float64(),
+    }
+    fields = [
+        pa.field(name, arrow_types.get(sql_type, pa.binary()))
+        for name, sql_type in TABLE_COLUMNS[table]
+    ]
+    if table not in SPATIAL_TABLES:
+        return pa.schema(fields)
+    geo = {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {"geometry": {
+            "encoding": "WKB",
+            "geometry_types": ["LineString" if table == LINES_TABLE else "Point"],
+            "crs": CRS.from_user_input(DEFAULT_CRS).to_json_dict(),
+        }},
+    }
+    return pa.schema(fields, metadata={b"geo": json.dumps(geo).encode("utf-8")})
+
+
+def _frame_to_arrow(gdf, schema):
+    import pyarrow as pa
+    import shapely
+
+    columns = []
+    for field in schema:
+        if field.name == "geometry":
+            columns.append(pa.array(shapely.to_wkb(gdf.geometry.to_numpy()), type=pa.binary()))
+        else:
+            columns.append(pa.array(gdf[field.name], type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_snapshot(
+    segments: Iterable[RoadSegment],
+    output_dir: Path,
+    batch_size: Optional[int] = None,
+):
+    """Write segments and places as uncompressed Arrow IPC (Feather v2) files.
+
+    The snapshot holds exactly the frames the loaders use, geometry as WKB,
+    so ``--mode load`` / ``--mode export`` can skip NDJSON decoding entirely.
+    Files are memory-mappable and carry ``geo`` metadata, so notebooks can
+    also open them with ``geopandas.read_feather``. Written batch by batch
+    to temporary files that replace the previous snapshot when complete.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        log.warning("pyarrow is not installed; skipping the columnar snapshot.")
+        return None
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {table: output_dir / name for table, name in SNAPSHOT_FILES.items()}
+    tmp_paths = {table: path.with_name(path.name + ".tmp") for table, path in paths.items()}
+    schemas = {table: _snapshot_schema(table) for table in paths}
+    counts = dict.fromkeys(paths, 0)
+
+    writers = {table: pa.ipc.new_file(str(tmp_paths[table]), schemas[table]) for table in paths}
+    try:
+        for frames in _iter_frames(segments, batch_size):
+            for table, gdf in _frame_tables(frames):
+                if not gdf.empty:
+                    writers[table].write_table(_frame_to_arrow(gdf, schemas[table]))
+                    counts[table] += len(gdf)
+    except Exception:
+        for writer in writers.values():
+            writer.close()
+        for tmp in tmp_paths.values():
+            tmp.unlink(missing_ok=True)
+        raise
+    for writer in writers.values():
+        writer.close()
+    for table, path in paths.items():
+        os.replace(tmp_paths[table], path)
+
+    log.info(
+        "Saved columnar snapshot (%d lines, %d points, %d links) → %s",
+        counts[LINES_TABLE], counts[POINTS_TABLE], counts[LINKS_TABLE], paths[LINES_TABLE].parent,
+    )
+    return tuple(paths.values())
+
+
+def open_snapshot_table(path: Path):
+    """Memory-map one snapshot file as a ``pyarrow.Table`` (zero-copy columns)."""
+    import pyarrow as pa
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def snapshot_is_fresh(input_dir: Path) -> bool:
+    """True when a complete snapshot exists and is newer than every NDJSON input."""
+    paths = [input_dir / name for name in SNAPSHOT_FILES.values()]
+    if not all(p.exists() for p in paths):
+        return False
+    oldest = min(p.stat().st_mtime for p in paths)
+    return all(f.stat().st_mtime <= oldest for f in input_dir.glob("*.ndjson"))
+
+
+def _arrow_to_frame(table: str, arrow):
+    """Convert one snapshot table (or a slice of it) to the loaders' frame type."""
+    import geopandas as gpd
+    import pandas as pd
+    import pyarrow as pa
+    import shapely
+
+    if table not in SPATIAL_TABLES:
+        return arrow.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    df = arrow.drop_columns(["geometry"]).to_pandas()
+    geoms = shapely.from_wkb(arrow.column("geometry").to_numpy(zero_copy_only=False))
+    return gpd.GeoDataFrame(df, geometry=geoms, crs=DEFAULT_CRS)
+
+
+def read_snapshot(input_dir: Path) -> SegmentFrames:
+    """Load a snapshot written by ``write_snapshot`` back into SegmentFrames."""
+    frames = {
+        table: _arrow_to_frame(table, open_snapshot_table(input_dir / name))
+        for table, name in SNAPSHOT_FILES.items()
+    }
+    lines, points = frames[LINES_TABLE], frames[POINTS_TABLE]
+    log.info("Read snapshot: %d lines, %d points from %s", len(lines), len(points), input_dir)
+    return SegmentFrames(lines, points, segment_count=len(lines), links=frames[LINKS_TABLE])
+
+
+class SnapshotSource:
+    """Re-iterable, batch-by-batch view over a columnar snapshot (``--stream``).
+
+    The Arrow files are memory-mapped and only one ``batch_size`` slice per
+    table is converted to pandas at a time, so streaming sinks keep the same
+    bounded memory as with NDJSON input.
+    """
+
+    def __init__(self, input_dir: Path):
+        self.input_dir = input_dir
+        self.count = open_snapshot_table(input_dir / SNAPSHOT_FILES[LINES_TABLE]).num_rows
+
+    def __len__(self) -> int:
+        return self.count
+
+    def frames(self, batch_size: Optional[int]) -> Iterator[SegmentFrames]:
+        """Yield SegmentFrames of at most ``batch_size`` lines and points each.
+
+        Link rows travel with their segment's slice, as the delta sync
+        relinks segments batch by batch.
+        """
+        import pyarrow.compute as pc
+
+        tables = {table: open_snapshot_table(self.input_dir / name)
+                  for table, name in SNAPSHOT_FILES.items()}
+        lines, points, links = tables[LINES_TABLE], tables[POINTS_TABLE], tables[LINKS_TABLE]
+        step = batch_size or max(lines.num_rows, points.num_rows, 1)
+        for start in range(0, max(lines.num_rows, points.num_rows, 1), step):
+            line_slice = lines.slice(start, step)
+            in_slice = pc.is_in(links.column("segment_id"),
+                                value_set=line_slice.column("segment_id"))
+            yield SegmentFrames(
+                _arrow_to_frame(LINES_TABLE, line_slice),
+                _arrow_to_frame(POINTS_TABLE, points.slice(start, step)),
+                segment_count=line_slice.num_rows,
+                links=_arrow_to_frame(LINKS_TABLE, links.filter(in_slice)),
+            )
 
 
 # ---------------------------------------------------------------------------
 # Export to GeoPackage / Shapefile (requires geopandas)
 # ---------------------------------------------------------------------------
 
-def export_with_geopandas(segments: list[RoadSegment], output_dir: Path, fmt: str = "gpkg"):
-    """Export to GeoPackage, Shapefile, or other OGR-supported format."""
+EXPORT_GEOMETRY_TYPES = {LINES_TABLE: "LineString", POINTS_TABLE: "Point"}
+
+
+def export_with_geopandas(
+    segments: Iterable[RoadSegment],
+    output_dir: Path,
+    fmt: str = "gpkg",
+    batch_size: Optional[int] = None,
+    engine: str = "to_file",
+):
+    """Export to GeoPackage, Shapefile, or other OGR-supported format.
+
+    With ``batch_size`` set, each batch is appended to the output layers so
+    memory stays bounded. ``engine="arrow"`` writes through pyogrio's Arrow
+    path instead of ``GeoDataFrame.to_file`` (see ``_export_arrow``).
+    """
     try:
-        import geopandas as gpd
-        from shapely.geometry import LineString, Point
+        import geopandas  # noqa: F401
+        import shapely  # noqa: F401
     except ImportError:
         log.error("geopandas and shapely are required for export. "
                   "Install with: pip install geopandas shapely")
@@ -340,48 +1589,6 @@ def export_with_geopandas(segments: list[RoadSegment], output_dir: Path, fmt: st
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # --- Lines GeoDataFrame ---
-    line_records = []
-    for seg in segments:
-        if len(seg.coordinates) < 2:
-            continue
-        line_records.append({
-            "segment_id": seg.segment_id,
-            "name": seg.name,
-            "road_type": seg.road_type,
-            "segment_certainty": seg.segment_certainty,
-            "construction_period": seg.construction_period,
-            "itinerary": seg.itinerary,
-            "author": seg.author,
-            "bibliography": seg.bibliography,
-            "description": seg.description,
-            "length_m": seg.length_m,
-            "lower_date": seg.lower_date,
-            "upper_date": seg.upper_date,
-            "source_url": f"{BASE_URL}/route-segment/{seg.segment_id}",
-            "geometry": LineString(seg.coordinates),
-        })
-    gdf_lines = gpd.GeoDataFrame(line_records, crs=DEFAULT_CRS)
-
-    # --- Points GeoDataFrame (deduplicated) ---
-    seen_ids = set()
-    point_records = []
-    for seg in segments:
-        for pl in seg.pleiades_places:
-            if pl.pleiades_id in seen_ids or pl.lon is None or pl.lat is None:
-                continue
-            seen_ids.add(pl.pleiades_id)
-            point_records.append({
-                "pleiades_id": pl.pleiades_id,
-                "name": pl.name,
-                "place_type": pl.place_type,
-                "start_year": pl.start_year,
-                "end_year": pl.end_year,
-                "url": pl.url,
-                "geometry": Point(pl.lon, pl.lat),
-            })
-    gdf_points = gpd.GeoDataFrame(point_records, crs=DEFAULT_CRS)
-
     ext_map = {"gpkg": ".gpkg", "shp": ".shp", "geojson": ".geojson"}
     driver_map = {"gpkg": "GPKG", "shp": "ESRI Shapefile", "geojson": "GeoJSON"}
     ext = ext_map.get(fmt, ".gpkg")
@@ -389,19 +1596,128 @@ def export_with_geopandas(segments: list[RoadSegment], output_dir: Path, fmt: st
 
     lines_out = output_dir / f"roman_road_segments{ext}"
     points_out = output_dir / f"roman_road_places{ext}"
-
     if fmt == "gpkg":
         # Both layers in one GeoPackage
-        gdf_lines.to_file(lines_out, layer=LINES_TABLE, driver=driver)
-        gdf_points.to_file(lines_out, layer=POINTS_TABLE, driver=driver)
-        log.info("Exported %d lines + %d points → %s", len(gdf_lines), len(gdf_points), lines_out)
+        points_out = lines_out
+
+    outputs = {LINES_TABLE: lines_out, POINTS_TABLE: points_out}
+    if engine == "arrow":
+        counts, timings = _export_arrow(segments, outputs, driver, batch_size)
     else:
-        gdf_lines.to_file(lines_out, driver=driver)
-        gdf_points.to_file(points_out, driver=driver)
-        log.info("Exported lines → %s", lines_out)
-        log.info("Exported points → %s", points_out)
+        counts, timings = _export_to_file(segments, outputs, driver, fmt == "gpkg", batch_size)
+    n_lines, n_points = counts[LINES_TABLE], counts[POINTS_TABLE]
 
-    return gdf_lines, gdf_points
+    for table in outputs:
+        elapsed = timings.get(table, 0.0)
+        log.info("  layer %s: %d features written in %.2fs (%.0f features/s)",
+                 table, counts[table], elapsed, counts[table] / elapsed if elapsed else 0)
+    if fmt == "gpkg":
+        log.info("Exported %d lines + %d points → %s", n_lines, n_points, lines_out)
+    else:
+        log.info("Exported %d lines → %s", n_lines, lines_out)
+        log.info("Exported %d points → %s", n_points, points_out)
+
+    return lines_out, points_out
+
+
+def _export_to_file(segments, outputs: dict, driver: str, named_layers: bool,
+                    batch_size: Optional[int]):
+    """Write both layers with ``GeoDataFrame.to_file``, one after the other."""
+    counts = dict.fromkeys(outputs, 0)
+    timings = dict.fromkeys(outputs, 0.0)
+    for frames in _iter_frames(segments, batch_size):
+        for table, gdf in ((LINES_TABLE, frames.lines), (POINTS_TABLE, frames.points)):
+            if gdf.empty:
+                continue
+            # content_hash is a database bookkeeping column, not part of the export
+            gdf = gdf.drop(columns="content_hash")
+            layer_kwargs = {"layer": table} if named_layers else {}
+            start = time.perf_counter()
+            gdf.to_file(outputs[table], driver=driver, mode="a" if counts[table] else "w",
+                        **layer_kwargs)
+            timings[table] += time.perf_counter() - start
+            counts[table] += len(gdf)
+    return counts, timings
+
+
+def _export_arrow(segments, outputs: dict, driver: str, batch_size: Optional[int]):
+    """Write both layers with ``pyogrio.write_arrow``.
+
+    Each layer is fed to GDAL as one Arrow stream, so it is written in a
+    single transaction however many batches it arrives in, and GeoPackage
+    layers get their RTree spatial index. Layers in separate files (Shapefile,
+    GeoJSON) are written concurrently on two threads; a GeoPackage has a
+    single SQLite writer, so its points layer is buffered and written after
+    the lines layer completes.
+    """
+    import pyarrow as pa
+    import pyogrio
+    from pyproj import CRS
+
+    crs_wkt = CRS.from_user_input(DEFAULT_CRS).to_wkt()
+    schemas = {}
+    for table in outputs:
+        schema = _snapshot_schema(table)
+        schemas[table] = schema.remove(schema.get_field_index("content_hash")).remove_metadata()
+    layer_options = {"SPATIAL_INDEX": "YES"} if driver == "GPKG" else None
+    shared_file = outputs[LINES_TABLE] == outputs[POINTS_TABLE]
+    # Bounded queues keep streamed exports in bounded memory; a shared
+    # GeoPackage must hold the points back until the lines writer is done
+    queues = {
+        table: queue.Queue(maxsize=0 if shared_file and table == POINTS_TABLE else 4)
+        for table in outputs
+    }
+    counts = dict.fromkeys(outputs, 0)
+    timings = {}
+
+    def write_layer(table):
+        def batches():
+            while (tbl := queues[table].get()) is not None:
+                yield from tbl.to_batches()
+
+        reader = pa.RecordBatchReader.from_batches(schemas[table], batches())
+        start = time.perf_counter()
+        pyogrio.write_arrow(
+            reader, str(outputs[table]),
+            layer=table if driver == "GPKG" else None,
+            driver=driver,
+            geometry_name="geometry",
+            geometry_type=EXPORT_GEOMETRY_TYPES[table],
+            crs=crs_wkt,
+            encoding="UTF-8" if driver == "ESRI Shapefile" else None,
+            layer_options=layer_options,
+        )
+        timings[table] = time.perf_counter() - start
+
+    def put(table, item):
+        future = futures.get(table)
+        while True:
+            try:
+                queues[table].put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if future is not None and future.done():
+                    future.result()  # re-raise the writer's error
+                    return
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {LINES_TABLE: pool.submit(write_layer, LINES_TABLE)}
+        if not shared_file:
+            futures[POINTS_TABLE] = pool.submit(write_layer, POINTS_TABLE)
+        try:
+            for frames in _iter_frames(segments, batch_size):
+                for table, gdf in ((LINES_TABLE, frames.lines), (POINTS_TABLE, frames.points)):
+                    if not gdf.empty:
+                        put(table, _frame_to_arrow(gdf, schemas[table]))
+                        counts[table] += len(gdf)
+        finally:
+            for table in outputs:
+                put(table, None)
+        futures[LINES_TABLE].result()
+        if shared_file:
+            futures[POINTS_TABLE] = pool.submit(write_layer, POINTS_TABLE)
+        futures[POINTS_TABLE].result()
+    return counts, timings
 
 
 # ---------------------------------------------------------------------------
@@ -420,16 +1736,138 @@ def get_db_url(cli_url: Optional[str] = None) -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
 
 
+# Explicit column types for tables created by the COPY loader; column order
+# matches the frames produced by build_geodataframes
+TABLE_COLUMNS = {
+    LINES_TABLE: [
+        ("segment_id", "bigint"),
+        ("name", "text"),
+        ("road_type", "text"),
+        ("segment_certainty", "text"),
+        ("construction_period", "text"),
+        ("itinerary", "text"),
+        ("author", "text"),
+        ("bibliography", "text"),
+        ("description", "text"),
+        ("length_m", "double precision"),
+        ("lower_date", "integer"),
+        ("upper_date", "integer"),
+        ("source_url", "text"),
+        ("content_hash", "text"),
+        ("geometry", "geometry(LineString, 4326)"),
+    ],
+    POINTS_TABLE: [
+        ("pleiades_id", "bigint"),
+        ("name", "text"),
+        ("place_type", "text"),
+        ("start_year", "integer"),
+        ("end_year", "integer"),
+        ("url", "text"),
+        ("content_hash", "text"),
+        ("geometry", "geometry(Point, 4326)"),
+    ],
+    LINKS_TABLE: [
+        ("segment_id", "bigint"),
+        ("pleiades_id", "bigint"),
+        ("place_order", "integer"),
+    ],
+}
+PRIMARY_KEYS = {LINES_TABLE: "segment_id", POINTS_TABLE: "pleiades_id"}
+
+# Simplification tolerance (degrees) per display zoom — about one 256 px tile
+# pixel at that zoom; geom_z8 matches the ST_Simplify(geometry, 0.005) the
+# roman-roads notebook used to run per query
+ZOOM_TOLERANCES = {"geom_z5": 0.04, "geom_z8": 0.005, "geom_z12": 0.0003}
+
+# Columns PostgreSQL derives from ``geometry`` as STORED generated columns:
+# computed once when a row is written, by every loader (to_postgis, COPY,
+# upsert, delta), and never stale after an update
+DERIVED_COLUMNS = {
+    LINES_TABLE: [
+        ("length_geodesic_m", "double precision", "ST_Length(geometry::geography)"),
+        *((name, "geometry(Geometry, 4326)", f"ST_Simplify(geometry, {tolerance})")
+          for name, tolerance in ZOOM_TOLERANCES.items()),
+    ],
+}
+
+
+def _derived_column_ddl(qualified_table: str, table: str,
+                        present: Iterable[str] = ()) -> Optional[str]:
+    """One ``ALTER TABLE`` adding the derived columns not in ``present``.
+
+    All columns go in a single statement, so a table that lacks several of
+    them is rewritten once rather than once per column. ``None`` when
+    nothing is missing: callers pass the table's existing columns because
+    even a no-op ``ADD COLUMN IF NOT EXISTS`` takes an ACCESS EXCLUSIVE lock
+    on the live table.
+    """
+    present = set(present)
+    columns = [c for c in DERIVED_COLUMNS.get(table, []) if c[0] not in present]
+    if not columns:
+        return None
+    return f"ALTER TABLE {qualified_table} " + ", ".join(
+        f"ADD COLUMN IF NOT EXISTS {name} {sql_type} GENERATED ALWAYS AS ({expression}) STORED"
+        for name, sql_type, expression in columns
+    ) + ";"
+
+
+def _table_columns(cur, qualified_table: str) -> set:
+    """Column names of a table through a DB-API cursor (empty if it does not exist)."""
+    cur.execute(
+        "SELECT attname FROM pg_attribute "
+        "WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped",
+        (qualified_table,),
+    )
+    return {row[0] for row in cur.fetchall()}
+
+
+def _present_derived_columns(conn, schema: str, table: str) -> set:
+    """Derived columns a table already has, through a SQLAlchemy connection."""
+    return {name for name, _, _ in DERIVED_COLUMNS.get(table, [])
+            if _has_column(conn, schema, table, name)}
+
+
+def _bump_data_versions(conn, tables: Iterable[str]):
+    """Advance the ``data_versions`` stamp of each ``schema.table`` in ``tables``.
+
+    ``conn`` is a SQLAlchemy connection; the bump commits with its
+    transaction. Cached query results that read these tables (see
+    ``db_connection.query_to_geodataframe(cache=True)``) become stale.
+    """
+    from sqlalchemy import text
+
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DATA_VERSIONS_TABLE} ("
+        f"table_name text PRIMARY KEY, version bigint NOT NULL, "
+        f"updated_at timestamptz NOT NULL DEFAULT now())"
+    ))
+    for table in tables:
+        conn.execute(text(
+            f"INSERT INTO {DATA_VERSIONS_TABLE} AS v (table_name, version) VALUES (:t, 1) "
+            f"ON CONFLICT (table_name) DO UPDATE "
+            f"SET version = v.version + 1, updated_at = now()"
+        ), {"t": table})
+
+
 def load_to_postgis(
-    segments: list[RoadSegment],
+    segments: Iterable[RoadSegment],
     db_url: str,
     if_exists: str = "replace",
     schema: str = "public",
+    batch_size: Optional[int] = None,
+    method: str = "to_postgis",
 ):
-    """Load road segments (lines) and places (points) into PostGIS tables."""
+    """Load road segments (lines) and places (points) into PostGIS tables.
+
+    With ``batch_size`` set, the first batch is written with ``if_exists`` and
+    every later batch is appended. ``method="copy"`` uses the COPY-based
+    loader (see ``_copy_load``) instead of ``GeoDataFrame.to_postgis``.
+    ``if_exists="upsert"`` keeps the tables and merges rows by primary key
+    (see ``_upsert_load``). Returns ``(n_lines, n_points)``.
+    """
     try:
-        import geopandas as gpd
-        from shapely.geometry import LineString, Point
+        import geopandas  # noqa: F401
+        import shapely  # noqa: F401
         from sqlalchemy import create_engine, text
     except ImportError:
         log.error(
@@ -446,80 +1884,883 @@ def load_to_postgis(
         conn.commit()
     log.info("PostGIS extension confirmed.")
 
-    # --- Build GeoDataFrames ---
-    line_records = []
-    for seg in segments:
-        if len(seg.coordinates) < 2:
-            continue
-        line_records.append({
-            "segment_id": seg.segment_id,
-            "name": seg.name,
-            "road_type": seg.road_type,
-            "segment_certainty": seg.segment_certainty,
-            "construction_period": seg.construction_period,
-            "itinerary": seg.itinerary,
-            "author": seg.author,
-            "bibliography": seg.bibliography,
-            "description": seg.description,
-            "length_m": seg.length_m,
-            "lower_date": seg.lower_date,
-            "upper_date": seg.upper_date,
-            "source_url": f"{BASE_URL}/route-segment/{seg.segment_id}",
-            "geometry": LineString(seg.coordinates),
-        })
-    gdf_lines = gpd.GeoDataFrame(line_records, crs=DEFAULT_CRS)
+    started = time.perf_counter()
+    if if_exists == "upsert":
+        method = "upsert"
+        n_lines, n_points = _upsert_load(engine, segments, schema, batch_size)
+    elif method == "copy":
+        n_lines, n_points = _copy_load(engine, segments, schema, if_exists, batch_size)
+    else:
+        # --- Build GeoDataFrames and write to PostGIS, batch by batch ---
+        n_lines = n_points = n_links = 0
+        for frames in _iter_frames(segments, batch_size):
+            gdf_lines, gdf_points = frames.lines, frames.points
+
+            if not gdf_lines.empty:
+                gdf_lines.to_postgis(
+                    LINES_TABLE, engine, schema=schema,
+                    if_exists="append" if n_lines else if_exists, index=False,
+                )
+                n_lines += len(gdf_lines)
+
+            if not gdf_points.empty:
+                gdf_points.to_postgis(
+                    POINTS_TABLE, engine, schema=schema,
+                    if_exists="append" if n_points else if_exists, index=False,
+                )
+                n_points += len(gdf_points)
+
+            if frames.links is not None and not frames.links.empty:
+                frames.links.to_sql(
+                    LINKS_TABLE, engine, schema=schema,
+                    if_exists="append" if n_links else if_exists, index=False,
+                )
+                n_links += len(frames.links)
+
+        # --- Derived columns and spatial indexes ---
+        with engine.connect() as conn:
+            for table in SPATIAL_TABLES:
+                derived = _derived_column_ddl(f"{schema}.{table}", table,
+                                              _present_derived_columns(conn, schema, table))
+                if derived:
+                    conn.execute(text(derived))
+                idx_name = f"idx_{table}_geom"
+                conn.execute(text(f"DROP INDEX IF EXISTS {schema}.{idx_name};"))
+                conn.execute(text(
+                    f"CREATE INDEX {idx_name} ON {schema}.{table} USING GIST (geometry);"
+                ))
+            conn.commit()
+        log.info("Spatial indexes created.")
+    with engine.begin() as conn:
+        _bump_data_versions(conn, (f"{schema}.{t}" for t in (*SPATIAL_TABLES, LINKS_TABLE)))
+    elapsed = time.perf_counter() - started
+
+    if n_lines:
+        log.info("Loaded %d road segments → %s.%s", n_lines, schema, LINES_TABLE)
+    if n_points:
+        log.info("Loaded %d places → %s.%s", n_points, schema, POINTS_TABLE)
+    log.info(
+        "Load throughput (%s): %d rows in %.1fs — %.0f rows/s",
+        method, n_lines + n_points, elapsed, (n_lines + n_points) / elapsed if elapsed else 0,
+    )
 
-    seen_ids = set()
-    point_records = []
-    for seg in segments:
-        for pl in seg.pleiades_places:
-            if pl.pleiades_id in seen_ids or pl.lon is None or pl.lat is None:
-                continue
-            seen_ids.add(pl.pleiades_id)
-            point_records.append({
-                "pleiades_id": pl.pleiades_id,
-                "name": pl.name,
-                "place_type": pl.place_type,
-                "start_year": pl.start_year,
-                "end_year": pl.end_year,
-                "url": pl.url,
-                "geometry": Point(pl.lon, pl.lat),
-            })
-    gdf_points = gpd.GeoDataFrame(point_records, crs=DEFAULT_CRS)
-
-    # --- Write to PostGIS ---
-    if not gdf_lines.empty:
-        gdf_lines.to_postgis(
-            LINES_TABLE, engine, schema=schema,
-            if_exists=if_exists, index=False,
+    # --- Print verification queries ---
+    log.info("--- Verify with these psql queries ---")
+    log.info("  SELECT count(*), road_type, segment_certainty "
+             "FROM %s GROUP BY road_type, segment_certainty;", LINES_TABLE)
+    log.info("  SELECT count(*), place_type FROM %s GROUP BY place_type;", POINTS_TABLE)
+    log.info("  SELECT p.name FROM %s l JOIN %s p USING (pleiades_id) "
+             "WHERE l.segment_id = 31702 ORDER BY l.place_order;", LINKS_TABLE, POINTS_TABLE)
+    log.info("  SELECT name, length_geodesic_m "
+             "FROM %s ORDER BY length_geodesic_m DESC LIMIT 10;", LINES_TABLE)
+    return n_lines, n_points
+
+
+# Rows rendered to CSV at a time when feeding COPY
+COPY_SLICE_ROWS = 10_000
+
+
+class _ChunkReader:
+    """Minimal read-only file object over an iterator of text chunks.
+
+    Lets ``copy_expert`` pull COPY data as it goes, so only the chunk being
+    sent is held as text.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._chunk = ""
+        self._pos = 0
+
+    def read(self, size: int = -1) -> str:
+        parts = []
+        while size != 0:
+            if self._pos >= len(self._chunk):
+                self._chunk = next(self._chunks, None)
+                self._pos = 0
+                if self._chunk is None:
+                    self._chunk = ""
+                    break
+            end = len(self._chunk) if size < 0 else min(len(self._chunk), self._pos + size)
+            parts.append(self._chunk[self._pos:end])
+            if size > 0:
+                size -= end - self._pos
+            self._pos = end
+        return "".join(parts)
+
+
+def _csv_slices(table: str, gdf, slice_rows: int = COPY_SLICE_ROWS) -> Iterator[str]:
+    """Render ``gdf`` as COPY-ready CSV text, ``slice_rows`` rows at a time."""
+    import shapely
+
+    columns = TABLE_COLUMNS[table]
+    names = [name for name, _ in columns]
+    for start in range(0, len(gdf), slice_rows):
+        part = gdf.iloc[start:start + slice_rows]
+        df = part.drop(columns="geometry", errors="ignore")
+        for name, sql_type in columns:
+            if sql_type in ("integer", "bigint"):
+                # Nullable ints arrive as floats; COPY into integer needs "-50", not "-50.0"
+                df[name] = df[name].astype("Int64")
+        if table in SPATIAL_TABLES:
+            df["geometry"] = shapely.to_wkb(
+                shapely.set_srid(part.geometry.to_numpy(), 4326), hex=True, include_srid=True,
+            )
+        yield df[names].to_csv(index=False, header=False)
+
+
+def _copy_rows(cur, qualified_table: str, table: str, gdf):
+    """Stream one GeoDataFrame into ``qualified_table`` with COPY FROM STDIN.
+
+    Geometries are sent as hex-encoded EWKB (SRID included), which PostGIS
+    accepts directly as geometry input — no WKT round trip or per-row INSERT.
+    Rows are rendered to CSV ``COPY_SLICE_ROWS`` at a time while COPY reads,
+    so the text form of the whole frame never sits in memory.
+    """
+    names = [name for name, _ in TABLE_COLUMNS[table]]
+    cur.copy_expert(
+        f"COPY {qualified_table} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)",
+        _ChunkReader(_csv_slices(table, gdf)),
+    )
+
+
+def _copy_load(engine, segments, schema: str, if_exists: str, batch_size: Optional[int]):
+    """COPY-based loader: staging tables, indexes, then an atomic swap.
+
+    For ``replace`` (and ``fail`` when the tables are absent) rows are COPYed
+    into ``<table>__staging``, the GiST index is built there, and a single
+    transaction drops the live table and renames the staging table into its
+    place — readers see either the old or the new table, never a partial
+    one. ``append`` COPYs straight into the live tables in one transaction.
+    The segment–place link table goes through the same staging and swap.
+    """
+    tables = [LINES_TABLE, POINTS_TABLE, LINKS_TABLE]
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = %s AND table_name = ANY(%s)", (schema, tables),
         )
-        log.info("Loaded %d road segments → %s.%s", len(gdf_lines), schema, LINES_TABLE)
+        existing = {row[0] for row in cur.fetchall()}
+        if if_exists == "fail" and existing:
+            raise ValueError(f"Table(s) {', '.join(sorted(existing))} already exist in {schema}.")
+
+        swap = if_exists != "append"
+        targets = {}
+        for table in tables:
+            ddl = ", ".join(f"{name} {sql_type}" for name, sql_type in TABLE_COLUMNS[table])
+            if swap:
+                targets[table] = f"{schema}.{table}__staging"
+                cur.execute(f"DROP TABLE IF EXISTS {targets[table]};")
+                cur.execute(f"CREATE TABLE {targets[table]} ({ddl});")
+            else:
+                targets[table] = f"{schema}.{table}"
+                cur.execute(f"CREATE TABLE IF NOT EXISTS {targets[table]} ({ddl});")
+            # Added before COPY so they are computed as rows arrive
+            derived = _derived_column_ddl(targets[table], table,
+                                          _table_columns(cur, targets[table]))
+            if derived:
+                cur.execute(derived)
+
+        counts = dict.fromkeys(tables, 0)
+        for frames in _iter_frames(segments, batch_size):
+            for table, gdf in _frame_tables(frames):
+                if not gdf.empty:
+                    _copy_rows(cur, targets[table], table, gdf)
+                    counts[table] += len(gdf)
+            log.debug("  COPY: %d lines, %d points so far", counts[LINES_TABLE], counts[POINTS_TABLE])
+        n_lines, n_points = counts[LINES_TABLE], counts[POINTS_TABLE]
+
+        for table in SPATIAL_TABLES:
+            idx_name = f"idx_{table}_geom"
+            if swap:
+                cur.execute(f"CREATE INDEX {idx_name}__staging ON {targets[table]} USING GIST (geometry);")
+            else:
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {targets[table]} USING GIST (geometry);")
+        raw.commit()
+        log.info("Spatial indexes created.")
+
+        if swap:
+            # One short transaction: concurrent readers block briefly on the
+            # lock and then see the new table
+            for table in tables:
+                cur.execute(f"DROP TABLE IF EXISTS {schema}.{table};")
+                cur.execute(f"ALTER TABLE {schema}.{table}__staging RENAME TO {table};")
+                if table in SPATIAL_TABLES:
+                    cur.execute(
+                        f"ALTER INDEX {schema}.idx_{table}_geom__staging RENAME TO idx_{table}_geom;"
+                    )
+            raw.commit()
+            log.info("Swapped staging tables into place.")
+        cur.close()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return n_lines, n_points
+
+
+def _ensure_primary_key(cur, schema: str, table: str):
+    """Give a table created by an older replace/append load its primary key."""
+    key = PRIMARY_KEYS[table]
+    cur.execute(
+        "SELECT 1 FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'p'", (f"{schema}.{table}",),
+    )
+    if cur.fetchone():
+        return
+    cur.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN IF NOT EXISTS content_hash text;")
+    cur.execute(
+        f"SELECT count(*) - count(DISTINCT {key}) FROM {schema}.{table}"
+    )
+    duplicates = cur.fetchone()[0]
+    if duplicates:
+        raise ValueError(
+            f"{schema}.{table} has {duplicates} duplicate {key} values (from an earlier "
+            f"append load); run one --db-if-exists replace load before using upsert."
+        )
+    cur.execute(f"ALTER TABLE {schema}.{table} ADD PRIMARY KEY ({key});")
+    log.info("Added primary key (%s) to %s.%s", key, schema, table)
+
+
+def _upsert_load(engine, segments, schema: str, batch_size: Optional[int]):
+    """Merge segments and places into keyed tables with INSERT ... ON CONFLICT.
+
+    Tables are created if missing with ``segment_id`` / ``pleiades_id`` as
+    primary keys (existing tables get one added), so indexes, grants and views
+    built on them survive. Each batch is COPYed into a temporary table and
+    merged; conflicting rows are only rewritten when their ``content_hash``
+    differs, which keeps partial refreshes cheap. The link rows of every
+    segment in a batch are replaced wholesale.
+    """
+    tables = [LINES_TABLE, POINTS_TABLE]
+    stats = {t: {"inserted": 0, "updated": 0, "unchanged": 0} for t in tables}
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        for table in tables:
+            key = PRIMARY_KEYS[table]
+            ddl = ", ".join(f"{name} {sql_type}" for name, sql_type in TABLE_COLUMNS[table])
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table} ({ddl}, PRIMARY KEY ({key}));")
+            _ensure_primary_key(cur, schema, table)
+            derived = _derived_column_ddl(f"{schema}.{table}", table,
+                                          _table_columns(cur, f"{schema}.{table}"))
+            if derived:
+                cur.execute(derived)
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_geom "
+                f"ON {schema}.{table} USING GIST (geometry);"
+            )
+            cur.execute(
+                f"CREATE TEMP TABLE {table}__upsert (LIKE {schema}.{table}) ON COMMIT DROP;"
+            )
+        link_ddl = ", ".join(f"{name} {sql_type}" for name, sql_type in TABLE_COLUMNS[LINKS_TABLE])
+        cur.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{LINKS_TABLE} ({link_ddl});")
+
+        for frames in _iter_frames(segments, batch_size):
+            for table, gdf in ((LINES_TABLE, frames.lines), (POINTS_TABLE, frames.points)):
+                if gdf.empty:
+                    continue
+                key = PRIMARY_KEYS[table]
+                names = [name for name, _ in TABLE_COLUMNS[table]]
+                updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in names if name != key)
+                _copy_rows(cur, f"{table}__upsert", table, gdf)
+                # DISTINCT ON guards against a key repeated within one batch
+                # (ON CONFLICT cannot touch a row twice); xmax = 0 marks inserts
+                cur.execute(
+                    f"INSERT INTO {schema}.{table} AS t ({', '.join(names)}) "
+                    f"SELECT DISTINCT ON ({key}) {', '.join(names)} FROM {table}__upsert "
+                    f"ON CONFLICT ({key}) DO UPDATE SET {updates} "
+                    f"WHERE t.content_hash IS DISTINCT FROM EXCLUDED.content_hash "
+                    f"RETURNING (xmax = 0) AS inserted;"
+                )
+                flags = [row[0] for row in cur.fetchall()]
+                inserted = sum(flags)
+                stats[table]["inserted"] += inserted
+                stats[table]["updated"] += len(flags) - inserted
+                stats[table]["unchanged"] += len(gdf) - len(flags)
+                cur.execute(f"TRUNCATE {table}__upsert;")
+            if frames.links is not None and not frames.lines.empty:
+                cur.execute(
+                    f"DELETE FROM {schema}.{LINKS_TABLE} WHERE segment_id = ANY(%s);",
+                    (frames.lines["segment_id"].tolist(),),
+                )
+                if not frames.links.empty:
+                    _copy_rows(cur, f"{schema}.{LINKS_TABLE}", LINKS_TABLE, frames.links)
+        raw.commit()
+        cur.close()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    for table, st in stats.items():
+        log.info(
+            "Upsert %s.%s: %d inserted, %d updated, %d unchanged",
+            schema, table, st["inserted"], st["updated"], st["unchanged"],
+        )
+    n_lines = sum(stats[LINES_TABLE].values())
+    n_points = sum(stats[POINTS_TABLE].values())
+    return n_lines, n_points
+
+
+def _group_links(rows) -> dict:
+    """``{segment_id: [(pleiades_id, place_order), ...]}`` from link rows, sorted by order."""
+    grouped = {}
+    for segment_id, pleiades_id, place_order in rows:
+        grouped.setdefault(int(segment_id), []).append((int(pleiades_id), int(place_order)))
+    for links in grouped.values():
+        links.sort(key=lambda link: link[1])
+    return grouped
+
+
+def _has_column(conn, schema: str, table: str, column: str) -> bool:
+    from sqlalchemy import text
+    row = conn.execute(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = :schema AND table_name = :table AND column_name = :column"
+    ), {"schema": schema, "table": table, "column": column}).first()
+    return row is not None
+
 
-    if not gdf_points.empty:
-        gdf_points.to_postgis(
-            POINTS_TABLE, engine, schema=schema,
-            if_exists=if_exists, index=False,
+def sync_to_postgis(
+    segments: Iterable[RoadSegment],
+    db_url: str,
+    schema: str = "public",
+    batch_size: Optional[int] = None,
+    delete_missing: bool = True,
+):
+    """Apply only the differences between a snapshot and the loaded tables.
+
+    Every row loaded by ``load_to_postgis`` carries a ``content_hash`` of its
+    attributes and geometry. The new snapshot is fingerprinted the same way
+    and diffed against the hashes already in PostGIS by ``segment_id`` /
+    ``pleiades_id``: new rows are inserted, changed rows replaced, and — when
+    ``delete_missing`` is set, i.e. the input is a full snapshot — rows absent
+    from the input are deleted. All changes are applied in one transaction.
+    Link rows are diffed per segment on their own: a segment's rows are
+    rewritten whenever its ordered ``(pleiades_id, place_order)`` list
+    differs from the table's, even if the segment itself is unchanged, and
+    removed with deleted segments (a missing link table is created and
+    filled from the whole input). The link counts are per segment.
+
+    Falls back to a full ``load_to_postgis`` when the tables do not exist or
+    predate the ``content_hash`` column. Returns per-table counts.
+    """
+    try:
+        import geopandas  # noqa: F401
+        import shapely  # noqa: F401
+        from sqlalchemy import create_engine, text
+    except ImportError:
+        log.error(
+            "Required packages: geopandas, shapely, sqlalchemy, geoalchemy2, psycopg2-binary. "
+            "Install with: pip install geopandas shapely sqlalchemy geoalchemy2 psycopg2-binary"
         )
-        log.info("Loaded %d places → %s.%s", len(gdf_points), schema, POINTS_TABLE)
+        return
 
-    # --- Create spatial indexes ---
+    keys = PRIMARY_KEYS
+    engine = create_engine(db_url)
     with engine.connect() as conn:
-        for table in [LINES_TABLE, POINTS_TABLE]:
-            idx_name = f"idx_{table}_geom"
-            conn.execute(text(f"DROP INDEX IF EXISTS {schema}.{idx_name};"))
-            conn.execute(text(
-                f"CREATE INDEX {idx_name} ON {schema}.{table} USING GIST (geometry);"
-            ))
-        conn.commit()
-    log.info("Spatial indexes created.")
+        fingerprinted = all(_has_column(conn, schema, t, "content_hash") for t in keys)
+    if not fingerprinted:
+        log.info("No fingerprinted tables in schema %s yet — running a full load.", schema)
+        load_to_postgis(segments, db_url, if_exists="replace", schema=schema, batch_size=batch_size)
+        return None
+
+    # Link rows are diffed per segment, as (pleiades_id, place_order) lists,
+    # independently of the segment hash: a segment whose places change but
+    # whose attributes and geometry do not still gets relinked
+    stats = {t: {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+             for t in (*keys, LINKS_TABLE)}
+    present = {t: set() for t in keys}
+    with engine.begin() as conn:
+        for table in keys:
+            derived = _derived_column_ddl(f"{schema}.{table}", table,
+                                          _present_derived_columns(conn, schema, table))
+            if derived:
+                conn.execute(text(derived))
+        if not _has_column(conn, schema, LINKS_TABLE, "segment_id"):
+            ddl = ", ".join(f"{name} {sql_type}" for name, sql_type in TABLE_COLUMNS[LINKS_TABLE])
+            conn.execute(text(f"CREATE TABLE {schema}.{LINKS_TABLE} ({ddl})"))
+        previous = {
+            table: dict(conn.execute(text(
+                f"SELECT {key}, content_hash FROM {schema}.{table}"
+            )).fetchall())
+            for table, key in keys.items()
+        }
+        previous_links = _group_links(conn.execute(text(
+            f"SELECT segment_id, pleiades_id, place_order FROM {schema}.{LINKS_TABLE}"
+        )).fetchall())
+
+        for frames in _iter_frames(segments, batch_size):
+            for table, gdf in ((LINES_TABLE, frames.lines), (POINTS_TABLE, frames.points)):
+                if gdf.empty:
+                    continue
+                key = keys[table]
+                present[table].update(gdf[key].tolist())
+                old_hash = gdf[key].map(previous[table])
+                # New means absent by key: rows loaded before content_hash was
+                # added exist with a NULL hash and count as changed
+                is_new = ~gdf[key].isin(previous[table].keys())
+                is_changed = ~is_new & (old_hash.isna() | (old_hash != gdf["content_hash"]))
+                stats[table]["inserted"] += int(is_new.sum())
+                stats[table]["updated"] += int(is_changed.sum())
+                stats[table]["unchanged"] += int((~is_new & ~is_changed).sum())
+
+                changed_ids = gdf.loc[is_changed, key].tolist()
+                if changed_ids:
+                    conn.execute(text(
+                        f"DELETE FROM {schema}.{table} WHERE {key} = ANY(:ids)"
+                    ), {"ids": changed_ids})
+                to_write = gdf[is_new | is_changed]
+                if not to_write.empty:
+                    to_write.to_postgis(table, conn, schema=schema, if_exists="append", index=False)
+                if table == LINES_TABLE and frames.links is not None:
+                    links = frames.links
+                    current_links = _group_links(zip(links["segment_id"].tolist(),
+                                                     links["pleiades_id"].tolist(),
+                                                     links["place_order"].tolist()))
+                    relink = []
+                    for sid in gdf[key].tolist():
+                        old, new = previous_links.get(sid, []), current_links.get(sid, [])
+                        if old == new:
+                            stats[LINKS_TABLE]["unchanged"] += 1
+                            continue
+                        relink.append(sid)
+                        stats[LINKS_TABLE]["inserted" if not old else
+                                           "deleted" if not new else "updated"] += 1
+                    stale = [sid for sid in relink if sid in previous_links]
+                    if stale:
+                        conn.execute(text(
+                            f"DELETE FROM {schema}.{LINKS_TABLE} WHERE segment_id = ANY(:ids)"
+                        ), {"ids": stale})
+                    new_links = links[links["segment_id"].isin(relink)]
+                    if not new_links.empty:
+                        new_links.to_sql(LINKS_TABLE, conn, schema=schema,
+                                         if_exists="append", index=False)
+
+        if delete_missing:
+            for table, key in keys.items():
+                gone = [k for k in previous[table] if k not in present[table]]
+                if gone:
+                    conn.execute(text(
+                        f"DELETE FROM {schema}.{table} WHERE {key} = ANY(:ids)"
+                    ), {"ids": gone})
+                    if table == LINES_TABLE:
+                        conn.execute(text(
+                            f"DELETE FROM {schema}.{LINKS_TABLE} WHERE segment_id = ANY(:ids)"
+                        ), {"ids": gone})
+                        stats[LINKS_TABLE]["deleted"] += sum(k in previous_links for k in gone)
+                stats[table]["deleted"] = len(gone)
+
+        # An unchanged snapshot leaves the stamps alone, so cached results stay valid
+        if any(st["inserted"] or st["updated"] or st["deleted"] for st in stats.values()):
+            _bump_data_versions(conn, (f"{schema}.{t}" for t in stats))
+
+    for table, st in stats.items():
+        log.info(
+            "Delta sync %s.%s: %d inserted, %d updated, %d deleted, %d unchanged",
+            schema, table, st["inserted"], st["updated"], st["deleted"], st["unchanged"],
+        )
+    return stats
 
-    # --- Print verification queries ---
-    log.info("--- Verify with these psql queries ---")
-    log.info("  SELECT count(*), road_type, segment_certainty "
-             "FROM %s GROUP BY road_type, segment_certainty;", LINES_TABLE)
-    log.info("  SELECT count(*), place_type FROM %s GROUP BY place_type;", POINTS_TABLE)
-    log.info("  SELECT name, ST_Length(geometry::geography) AS length_m "
-             "FROM %s ORDER BY length_m DESC LIMIT 10;", LINES_TABLE)
+
+# ---------------------------------------------------------------------------
+# Post-load optimization: attribute indexes, CLUSTER, ANALYZE
+# ---------------------------------------------------------------------------
+
+# B-tree indexes for the attribute filters used by the analysis notebooks
+ATTRIBUTE_INDEXES = {
+    LINES_TABLE: ["segment_id", "road_type", "segment_certainty"],
+    POINTS_TABLE: ["pleiades_id", "place_type"],
+    # "places along this road" / "roads through this place"
+    LINKS_TABLE: ["segment_id", "pleiades_id"],
+}
+
+
+def optimize_postgis(
+    db_url: str,
+    schema: str = "public",
+    concurrently: bool = False,
+    cluster: bool = False,
+):
+    """Index, optionally cluster, and analyze the loaded tables.
+
+    Builds a B-tree index on each column in ``ATTRIBUTE_INDEXES`` that is not
+    already the leading column of a valid index (a primary key counts), and
+    makes sure the GiST index on ``geometry`` exists. ``concurrently`` uses
+    ``CREATE INDEX CONCURRENTLY`` so readers and writers of a live table are
+    not blocked; invalid leftovers of an interrupted concurrent build are
+    dropped first. ``cluster`` rewrites each table in spatial-index order
+    (this takes an exclusive lock for the duration). Every run ends with
+    ``ANALYZE`` so the planner sees the new row counts and distributions.
+    """
+    try:
+        from sqlalchemy import create_engine
+    except ImportError:
+        log.error("sqlalchemy and psycopg2-binary are required. "
+                  "Install with: pip install sqlalchemy psycopg2-binary")
+        return
+
+    engine = create_engine(db_url)
+    raw = engine.raw_connection()
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block. Set
+        # on the psycopg2 connection itself: the pool proxy does not forward it.
+        raw.dbapi_connection.autocommit = True
+        cur = raw.cursor()
+        concurrent = " CONCURRENTLY" if concurrently else ""
+        for table in ATTRIBUTE_INDEXES:
+            qualified = f"{schema}.{table}"
+            cur.execute("SELECT to_regclass(%s)", (qualified,))
+            if cur.fetchone()[0] is None:
+                continue
+            started = time.perf_counter()
+
+            cur.execute(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = %s::regclass AND NOT i.indisvalid", (qualified,),
+            )
+            for (invalid,) in cur.fetchall():
+                cur.execute(f"DROP INDEX{concurrent} IF EXISTS {schema}.{invalid};")
+                log.info("  dropped invalid index %s.%s", schema, invalid)
+
+            cur.execute(
+                "SELECT a.attname FROM pg_index i JOIN pg_attribute a "
+                "ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0] "
+                "WHERE i.indrelid = %s::regclass AND i.indisvalid", (qualified,),
+            )
+            indexed = {row[0] for row in cur.fetchall()}
+            spatial = table in SPATIAL_TABLES
+            if spatial and "geometry" not in indexed:
+                cur.execute(
+                    f"CREATE INDEX{concurrent} IF NOT EXISTS idx_{table}_geom "
+                    f"ON {qualified} USING GIST (geometry);"
+                )
+            for column in ATTRIBUTE_INDEXES[table]:
+                if column in indexed:
+                    continue
+                cur.execute(
+                    f"CREATE INDEX{concurrent} IF NOT EXISTS idx_{table}_{column} "
+                    f"ON {qualified} ({column});"
+                )
+                log.info("  indexed %s.%s", qualified, column)
+
+            if cluster and spatial:
+                cur.execute(
+                    "SELECT c.relname FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "JOIN pg_am am ON am.oid = c.relam "
+                    "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0] "
+                    "WHERE i.indrelid = %s::regclass AND i.indisvalid "
+                    "AND am.amname = 'gist' AND a.attname = 'geometry' LIMIT 1", (qualified,),
+                )
+                row = cur.fetchone()
+                if row:
+                    cur.execute(f"CLUSTER {qualified} USING {row[0]};")
+            cur.execute(f"ANALYZE {qualified};")
+            log.info("Optimized %s (%s%s) in %.1fs", qualified,
+                     "clustered, " if cluster and spatial else "", "analyzed",
+                     time.perf_counter() - started)
+        cur.close()
+    finally:
+        raw.dbapi_connection.autocommit = False
+        raw.close()
+
+
+# ---------------------------------------------------------------------------
+# Subdivided companion table for bbox intersection
+# ---------------------------------------------------------------------------
+
+DEFAULT_SUBDIVIDE_VERTICES = 64
+DEFAULT_SUBDIVIDE_PIECE_DEG = 0.5  # longest stretch of line one piece may span
+MIN_SUBDIVIDE_VERTICES = 5  # ST_Subdivide rejects anything smaller
+
+
+def build_subdivided_table(
+    db_url: str,
+    schema: str = "public",
+    max_vertices: int = DEFAULT_SUBDIVIDE_VERTICES,
+    max_piece_length: float = DEFAULT_SUBDIVIDE_PIECE_DEG,
+) -> Optional[int]:
+    """Rebuild ``roman_road_segments_subdivided`` and its intersection helper.
+
+    Every segment is cut with ``ST_Subdivide`` into pieces of at most
+    ``max_vertices`` vertices, each keyed back to ``segment_id``. Lines are
+    first densified with ``ST_Segmentize`` to a step of
+    ``max_piece_length / (max_vertices - 1)`` degrees, so that a full piece
+    spans at most ``max_piece_length`` along the line; without it a long
+    two-vertex sea lane could not be cut at all. The pieces have small
+    bounding boxes, so a GiST bbox probe on them returns few false
+    candidates. The table is built under a staging name and swapped in, in
+    one transaction, together with the SQL function::
+
+        SELECT s.segment_id, s.name, s.geometry
+        FROM roman_road_segments s
+        JOIN roman_road_segment_ids_intersecting(ST_MakeEnvelope(...)) USING (segment_id);
+
+    which returns the ids of the segments that intersect a geometry, using an
+    exact test on the small pieces only. Returns the number of pieces.
+
+    The pieces are a copy: loads that change ``roman_road_segments`` leave
+    them stale until the table is rebuilt. The CLI does so after every load
+    that changed the lines while the table exists, with the settings stored
+    in the table comment (see ``subdivided_table_settings``); library callers
+    of ``load_to_postgis`` / ``sync_to_postgis`` must call this themselves.
+    Raises ``ValueError`` if ``max_vertices`` is below 5 or
+    ``max_piece_length`` is not positive.
+    """
+    if max_vertices < MIN_SUBDIVIDE_VERTICES:
+        raise ValueError(f"max_vertices must be at least {MIN_SUBDIVIDE_VERTICES}, "
+                         f"got {max_vertices}")
+    if max_piece_length <= 0:
+        raise ValueError(f"max_piece_length must be positive, got {max_piece_length}")
+    step = float(max_piece_length) / (int(max_vertices) - 1)
+    try:
+        from sqlalchemy import create_engine
+    except ImportError:
+        log.error("sqlalchemy and psycopg2-binary are required. "
+                  "Install with: pip install sqlalchemy psycopg2-binary")
+        return None
+
+    started = time.perf_counter()
+    engine = create_engine(db_url)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        staging = f"{schema}.{SUBDIVIDED_TABLE}__staging"
+        cur.execute(f"DROP TABLE IF EXISTS {staging};")
+        cur.execute(
+            f"CREATE TABLE {staging} AS "
+            f"SELECT segment_id, "
+            f"ST_Subdivide(ST_Segmentize(geometry, %s), %s)::geometry(Geometry, 4326) AS geometry "
+            f"FROM {schema}.{LINES_TABLE} WHERE geometry IS NOT NULL;",
+            (step, int(max_vertices)),
+        )
+        n_pieces = cur.rowcount
+        # Read back by subdivided_table_settings to refresh with the same settings
+        cur.execute(f"COMMENT ON TABLE {staging} IS %s;", (json.dumps({
+            "max_vertices": int(max_vertices), "max_piece_length": float(max_piece_length),
+        }),))
+        cur.execute(
+            f"CREATE INDEX idx_{SUBDIVIDED_TABLE}_geom__staging ON {staging} USING GIST (geometry);"
+        )
+        cur.execute(
+            f"CREATE INDEX idx_{SUBDIVIDED_TABLE}_segment_id__staging ON {staging} (segment_id);"
+        )
+        cur.execute(f"DROP TABLE IF EXISTS {schema}.{SUBDIVIDED_TABLE};")
+        cur.execute(f"ALTER TABLE {staging} RENAME TO {SUBDIVIDED_TABLE};")
+        for suffix in ("geom", "segment_id"):
+            cur.execute(
+                f"ALTER INDEX {schema}.idx_{SUBDIVIDED_TABLE}_{suffix}__staging "
+                f"RENAME TO idx_{SUBDIVIDED_TABLE}_{suffix};"
+            )
+        # A string-bodied SQL function holds no dependency on the tables, so
+        # replace loads can still drop and swap them
+        cur.execute(
+            f"CREATE OR REPLACE FUNCTION {schema}.roman_road_segment_ids_intersecting(area geometry) "
+            f"RETURNS TABLE (segment_id bigint) LANGUAGE sql STABLE PARALLEL SAFE AS $$ "
+            f"SELECT DISTINCT d.segment_id FROM {schema}.{SUBDIVIDED_TABLE} d "
+            f"WHERE ST_Intersects(d.geometry, area) $$;"
+        )
+        raw.commit()
+        cur.execute(f"ANALYZE {schema}.{SUBDIVIDED_TABLE};")
+        raw.commit()
+        cur.close()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    with engine.begin() as conn:
+        _bump_data_versions(conn, [f"{schema}.{SUBDIVIDED_TABLE}"])
+
+    log.info("Subdivided %s.%s into %d pieces (≤ %d vertices) in %.1fs → %s.%s",
+             schema, LINES_TABLE, n_pieces, max_vertices, time.perf_counter() - started,
+             schema, SUBDIVIDED_TABLE)
+    return n_pieces
+
+
+def subdivided_table_settings(db_url: str, schema: str = "public") -> Optional[dict]:
+    """``build_subdivided_table`` keyword arguments the existing table was built with.
+
+    ``None`` when the subdivided table does not exist; an empty dict (the
+    defaults) when it predates the stored settings.
+    """
+    from sqlalchemy import create_engine, text
+
+    with create_engine(db_url).connect() as conn:
+        row = conn.execute(text(
+            "SELECT to_regclass(:t) IS NOT NULL, obj_description(to_regclass(:t), 'pg_class')"
+        ), {"t": f"{schema}.{SUBDIVIDED_TABLE}"}).first()
+    if not row[0]:
+        return None
+    try:
+        settings = json.loads(row[1] or "{}")
+    except ValueError:
+        return {}
+    return {k: settings[k] for k in ("max_vertices", "max_piece_length") if k in settings}
+
+
+# ---------------------------------------------------------------------------
+# Run instrumentation
+# ---------------------------------------------------------------------------
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unavailable."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakRSS:
+    """Context manager sampling RSS on a thread; ``start`` and ``peak`` in bytes."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start = self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        if self.start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        rss = current_rss()
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss)
+        return False
+
+
+def _mb(n_bytes: Optional[int]) -> Optional[float]:
+    return None if n_bytes is None else round(n_bytes / 1024 ** 2, 1)
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU of this process and its reaped children (parse workers)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def file_bytes(paths) -> int:
+    """Total size of output files; a shapefile counts with its sidecar files."""
+    total = 0
+    for path in set(Path(p) for p in paths if p):
+        siblings = path.parent.glob(path.stem + ".*") if path.suffix == ".shp" else [path]
+        total += sum(f.stat().st_size for f in siblings if f.exists())
+    return total
+
+
+@dataclass
+class StageMetrics:
+    """Measurements for one stage of a run; rows/bytes are filled in by the caller."""
+    name: str
+    status: str = "ok"
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows: Optional[int] = None
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+    rss_start_mb: Optional[float] = None
+    rss_peak_mb: Optional[float] = None
+    profile: Optional[str] = None
+
+
+class RunMetrics:
+    """Per-stage wall/CPU time, rows, bytes and peak RSS for one harvester run.
+
+    Wrap each stage in ``with metrics.stage("parse") as st:`` and set
+    ``st.rows`` / ``st.bytes_read`` / ``st.bytes_written`` inside the block.
+    With ``profile_dir`` set, every stage also runs under cProfile and its
+    stats are dumped to ``<profile_dir>/<nn>_<stage>.prof`` (view with
+    ``python -m pstats`` or snakeviz). In ``--stream`` mode parsing happens
+    lazily inside the sinks, so its cost shows up in those stages.
+    """
+
+    def __init__(self, profile_dir: Optional[Path] = None):
+        self.profile_dir = profile_dir
+        self.stages: list[StageMetrics] = []
+        self.started = time.time()
+        self._started_perf = time.perf_counter()
+        if profile_dir:
+            profile_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        record = StageMetrics(name)
+        profiler = None
+        if self.profile_dir:
+            import cProfile
+            profiler = cProfile.Profile()
+        mem = PeakRSS()
+        cpu_start = _cpu_seconds()
+        wall_start = time.perf_counter()
+        try:
+            with mem:
+                if profiler:
+                    profiler.enable()
+                try:
+                    yield record
+                finally:
+                    if profiler:
+                        profiler.disable()
+        except BaseException:
+            record.status = "failed"
+            raise
+        finally:
+            record.wall_s = round(time.perf_counter() - wall_start, 4)
+            record.cpu_s = round(_cpu_seconds() - cpu_start, 4)
+            record.rss_start_mb, record.rss_peak_mb = _mb(mem.start), _mb(mem.peak)
+            if profiler:
+                prof_path = self.profile_dir / f"{len(self.stages) + 1:02d}_{name}.prof"
+                profiler.dump_stats(prof_path)
+                record.profile = str(prof_path)
+            self.stages.append(record)
+            log.info("[metrics] %-12s %s  wall %.2fs  cpu %.2fs  rows %s  peak RSS %s MB",
+                     name, record.status, record.wall_s, record.cpu_s,
+                     record.rows if record.rows is not None else "-", record.rss_peak_mb)
+
+    def to_dict(self, **extra) -> dict:
+        peaks = [s.rss_peak_mb for s in self.stages if s.rss_peak_mb is not None]
+        failed = any(s.status != "ok" for s in self.stages)
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "status": "failed" if failed else "ok",
+            "wall_s": round(time.perf_counter() - self._started_perf, 4),
+            "peak_rss_mb": max(peaks) if peaks else None,
+            **extra,
+            "stages": [vars(s) for s in self.stages],
+        }
+
+    def write(self, path: Path, **extra):
+        """Write the run's metrics as JSON (atomically, so collectors never see half a file)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(**extra), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        log.info("Run metrics → %s", path)
 
 
 # ---------------------------------------------------------------------------
@@ -542,6 +2783,8 @@ def build_parser() -> argparse.ArgumentParser:
             "export: convert local files to gpkg/shp/geojson"
         ),
     )
+    p.add_argument("--force-download", action="store_true",
+                   help="Re-download and reprocess the bulk export even if unchanged")
     p.add_argument("--ids", type=int, nargs="+", help="Segment IDs to fetch (for --mode segments)")
     p.add_argument("--id-range", type=int, nargs=2, metavar=("START", "END"),
                    help="Inclusive range of segment IDs to fetch")
@@ -549,31 +2792,249 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--input", type=Path, help="Input directory or NDJSON file (for load/export)")
     p.add_argument("--format", choices=["gpkg", "shp", "geojson"], default="gpkg",
                    help="Export format (default: gpkg)")
+    p.add_argument("--export-engine", choices=["to_file", "arrow"], default="to_file",
+                   help="arrow: write via pyogrio's Arrow path (one transaction per layer, "
+                        "GPKG RTree index, layers in parallel when in separate files)")
+    p.add_argument("--precision", type=int, default=None,
+                   help="Round GeoJSON coordinates to N decimal places (6 ≈ 0.1 m)")
+    p.add_argument("--compact", action="store_true",
+                   help="Write GeoJSON without whitespace after separators")
+    p.add_argument("--export", action="store_true",
+                   help="Also export fetched data to --format (bulk/segments modes)")
     p.add_argument("--load-db", action="store_true", help="Also load fetched data into PostGIS")
     p.add_argument("--db-url", type=str, help="SQLAlchemy PostGIS URL (overrides env vars)")
-    p.add_argument("--db-if-exists", choices=["replace", "append", "fail"],
-                   default="replace", help="Behavior when table exists")
+    p.add_argument("--db-if-exists", choices=["replace", "append", "fail", "upsert"],
+                   default="replace",
+                   help="Behavior when table exists (upsert: merge by segment_id / pleiades_id)")
+    p.add_argument("--db-loader", choices=["to_postgis", "copy"], default="to_postgis",
+                   help="copy: COPY into staging tables and swap them in atomically")
+    p.add_argument("--skip-optimize", action="store_true",
+                   help="Skip the post-load attribute indexes and ANALYZE")
+    p.add_argument("--index-concurrently", action="store_true",
+                   help="Build post-load indexes with CREATE INDEX CONCURRENTLY (live tables)")
+    p.add_argument("--cluster", action="store_true",
+                   help="CLUSTER the tables on their spatial index after loading (exclusive lock)")
+    p.add_argument("--subdivide", action="store_true",
+                   help=f"After loading, rebuild {SUBDIVIDED_TABLE} (ST_Subdivide pieces) "
+                        "and the roman_road_segment_ids_intersecting() helper; an existing "
+                        "table is refreshed after any load that changes the lines")
+    p.add_argument("--subdivide-max-vertices", type=int, default=DEFAULT_SUBDIVIDE_VERTICES,
+                   help=f"Max vertices per subdivided piece, at least {MIN_SUBDIVIDE_VERTICES} "
+                        f"(default: {DEFAULT_SUBDIVIDE_VERTICES})")
+    p.add_argument("--delta", action="store_true",
+                   help="Apply only inserts/updates/deletes against the previously loaded snapshot")
     p.add_argument("--schema", default="public", help="PostGIS schema")
     p.add_argument("--delay", type=float, default=REQUEST_DELAY,
                    help="Seconds between individual API requests")
+    p.add_argument("--cache-dir", type=Path,
+                   help="Cache segment responses on disk here (e.g. ./cache/itinere)")
+    p.add_argument("--cache-ttl", type=float, default=168,
+                   help="Hours a cached segment stays fresh (default: 168)")
+    p.add_argument("--cache-404-ttl", type=float, default=24,
+                   help="Hours a cached 404 stays fresh (default: 24)")
+    p.add_argument("--cache-max-mb", type=float, default=500,
+                   help="Size cap of the response cache; LRU entries are evicted (default: 500)")
+    p.add_argument("--concurrency", type=int, default=1,
+                   help="Parallel segment requests; total rate is still capped at 1/--delay")
+    p.add_argument("--bbox", type=float, nargs=4, metavar=("WEST", "SOUTH", "EAST", "NORTH"),
+                   help="Keep only segments (and places) intersecting this EPSG:4326 box")
+    p.add_argument("--road-type", nargs="+", help="Keep only these road types (e.g. 'Main Road')")
+    p.add_argument("--certainty", nargs="+", help="Keep only these segment certainties")
+    p.add_argument("--date-range", type=int, nargs=2, metavar=("START", "END"),
+                   help="Keep segments in use during this year range (negative = BCE)")
+    p.add_argument("--ignore-snapshot", action="store_true",
+                   help="load/export: re-parse NDJSON even if a columnar snapshot is present")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Processes for parsing NDJSON files (default: 1, sequential)")
+    p.add_argument("--stream", action="store_true",
+                   help="Parse NDJSON lazily and feed every sink in bounded batches")
+    p.add_argument("--pack-coordinates", action="store_true",
+                   help="Hold parsed vertices in packed float64 buffers instead of lists "
+                        "(less memory; integer vertices are written as floats)")
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                   help=f"Segments per batch in --stream mode (default: {DEFAULT_BATCH_SIZE})")
+    p.add_argument("--metrics", type=Path, default=None,
+                   help="Write per-stage timing/memory metrics for this run as JSON")
+    p.add_argument("--profile", type=Path, default=None, metavar="DIR",
+                   help="Run each stage under cProfile and dump <nn>_<stage>.prof files to DIR")
     p.add_argument("--verbose", "-v", action="store_true")
     return p
 
 
+def _read_segments(
+    ndjson_files: list[Path],
+    stream: bool,
+    workers: int = 1,
+    filters: Optional[SegmentFilter] = None,
+    pack: bool = False,
+):
+    """Parse NDJSON inputs eagerly into a list, or lazily when streaming.
+
+    ``pack`` stores the vertices of an eager parse in CoordinateStores.
+    """
+    if stream:
+        return NDJSONSource(ndjson_files, workers=workers, filters=filters)
+    segments: list[RoadSegment] = []
+    for f in ndjson_files:
+        segments.extend(parse_ndjson(f, workers=workers, filters=filters, compact=pack))
+    return segments
+
+
+def _compact_coordinates(segments: list[RoadSegment]) -> bool:
+    """Move segment vertices into a shared CoordinateStore when NumPy is available.
+
+    Returns False when packing is unavailable, so callers can stop trying.
+    """
+    try:
+        store = CoordinateStore.from_segments(segments)
+    except ImportError:
+        return False
+    except (TypeError, ValueError, IndexError) as e:
+        log.warning("Could not pack coordinates into a compact store (%s); keeping lists.", e)
+        return False
+    log.debug("Packed %d vertices of %d segments into %.1f MB",
+              len(store.coords), len(store), store.coords.nbytes / 1e6)
+    return True
+
+
+def _read_input(
+    input_path: Path,
+    args: argparse.Namespace,
+    filters: Optional[SegmentFilter],
+    stage: Optional[StageMetrics] = None,
+):
+    """Input for load/export: a fresh columnar snapshot if present, else NDJSON."""
+    if (input_path.is_dir() and filters is None and not args.ignore_snapshot
+            and snapshot_is_fresh(input_path)):
+        try:
+            # Streaming runs slice the memory-mapped snapshot per batch
+            frames = SnapshotSource(input_path) if args.stream else read_snapshot(input_path)
+            if stage:
+                stage.bytes_read = file_bytes(input_path / name for name in SNAPSHOT_FILES.values())
+            return frames
+        except ImportError:
+            log.warning("pyarrow is not installed; reading NDJSON instead of the snapshot.")
+    ndjson_files = sorted(input_path.glob("*.ndjson")) if input_path.is_dir() else [input_path]
+    if stage:
+        stage.bytes_read = file_bytes(ndjson_files)
+    return _read_segments(ndjson_files, stream=args.stream, workers=args.workers,
+                          filters=filters, pack=args.pack_coordinates)
+
+
+def _frames_for_sinks(segments, n_sinks: int):
+    """Build the GeoDataFrames once when several sinks of this run need them.
+
+    An in-memory list feeding more than one frame sink (snapshot, export,
+    load) becomes a SegmentFrames that lives only as long as the run; streams
+    and single-sink runs pass through and are built per batch by each sink.
+    """
+    if isinstance(segments, list) and segments and n_sinks > 1:
+        return build_geodataframes(segments)
+    return segments
+
+
+def _segment_total(segments) -> Optional[int]:
+    """Segment count without consuming a stream (None until a stream has been read)."""
+    if isinstance(segments, (list, SegmentFrames, SnapshotSource)):
+        return len(segments)
+    return segments.count if segments.count else None
+
+
+def _load_db(segments, args: argparse.Namespace, batch_size: Optional[int],
+             delete_missing: bool, metrics: RunMetrics):
+    """DB load (full or delta) plus the post-load index stage."""
+    db_url = get_db_url(args.db_url)
+    lines_changed = True
+    with metrics.stage("db_load") as st:
+        if args.delta:
+            stats = sync_to_postgis(segments, db_url, schema=args.schema, batch_size=batch_size,
+                                    delete_missing=delete_missing)
+            if stats:
+                st.rows = sum(c["inserted"] + c["updated"] + c["unchanged"]
+                              for t, c in stats.items() if t in PRIMARY_KEYS)
+                lines_changed = any(stats[LINES_TABLE][k] for k in ("inserted", "updated", "deleted"))
+        else:
+            loaded = load_to_postgis(segments, db_url, if_exists=args.db_if_exists,
+                                     schema=args.schema, batch_size=batch_size,
+                                     method=args.db_loader)
+            if loaded:
+                st.rows = sum(loaded)
+    if not args.skip_optimize:
+        with metrics.stage("index"):
+            optimize_postgis(db_url, schema=args.schema, concurrently=args.index_concurrently,
+                             cluster=args.cluster)
+    if args.subdivide:
+        with metrics.stage("subdivide") as st:
+            st.rows = build_subdivided_table(db_url, schema=args.schema,
+                                             max_vertices=args.subdivide_max_vertices)
+    elif lines_changed:
+        # An existing subdivided table would otherwise keep the old geometries
+        settings = subdivided_table_settings(db_url, schema=args.schema)
+        if settings is not None:
+            log.info("Refreshing %s.%s: the load changed %s.", args.schema, SUBDIVIDED_TABLE,
+                     LINES_TABLE)
+            with metrics.stage("subdivide") as st:
+                st.rows = build_subdivided_table(db_url, schema=args.schema, **settings)
+
+
+def _export(segments, args: argparse.Namespace, batch_size: Optional[int], metrics: RunMetrics):
+    with metrics.stage("export") as st:
+        outputs = export_with_geopandas(segments, args.output, fmt=args.format,
+                                        batch_size=batch_size, engine=args.export_engine)
+        st.rows = _segment_total(segments)
+        if outputs:
+            st.bytes_written = file_bytes(outputs)
+
+
 def main():
     parser = build_parser()
     args = parser.parse_args()
+    if args.subdivide_max_vertices < MIN_SUBDIVIDE_VERTICES:
+        parser.error(f"--subdivide-max-vertices must be at least {MIN_SUBDIVIDE_VERTICES}")
 
     if args.verbose:
         log.setLevel(logging.DEBUG)
 
+    metrics = RunMetrics(profile_dir=args.profile)
+    try:
+        _run(parser, args, metrics)
+    finally:
+        if args.metrics:
+            metrics.write(args.metrics, mode=args.mode, argv=sys.argv[1:])
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, metrics: RunMetrics):
     segments: list[RoadSegment] = []
+    batch_size = args.batch_size if args.stream else None
+    filters = SegmentFilter.from_args(args)
 
     # ----- MODE: bulk -----
     if args.mode == "bulk":
-        ndjson_path = download_bulk_export(args.output)
-        segments = parse_ndjson(ndjson_path)
-        save_geojson(segments, args.output)
+        with metrics.stage("download") as st:
+            ndjson_path, changed = download_bulk_export(args.output, force=args.force_download)
+            st.bytes_written = ndjson_path.stat().st_size if changed else 0
+        unchanged = not changed and (args.output / "roman_road_segments.geojson").exists()
+        if unchanged and not (args.export or args.load_db):
+            log.info("Nothing to do: bulk export unchanged (use --force-download to rebuild).")
+            return
+        with metrics.stage("parse") as st:
+            segments = _read_segments([ndjson_path], stream=args.stream, workers=args.workers,
+                                      filters=filters, pack=args.pack_coordinates)
+            st.rows = _segment_total(segments)
+            st.bytes_read = ndjson_path.stat().st_size
+        # Only an unfiltered parse may stand in for the NDJSON on later runs
+        snapshot = filters is None and not unchanged
+        frames = _frames_for_sinks(segments, snapshot + bool(args.export) + bool(args.load_db))
+        if unchanged:
+            log.info("Bulk export unchanged; keeping the existing GeoJSON and snapshot.")
+        else:
+            with metrics.stage("save") as st:
+                outputs = list(save_geojson(segments, args.output, batch_size=batch_size,
+                                            precision=args.precision, compact=args.compact))
+                if snapshot:
+                    outputs.extend(write_snapshot(frames, args.output, batch_size=batch_size) or [])
+                st.rows = _segment_total(segments)
+                st.bytes_written = file_bytes(outputs)
 
     # ----- MODE: segments -----
     elif args.mode == "segments":
@@ -582,40 +3043,64 @@ def main():
             ids.extend(range(args.id_range[0], args.id_range[1] + 1))
         if not ids:
             parser.error("--mode segments requires --ids or --id-range")
-        segments = fetch_segments(ids, delay=args.delay)
-        save_geojson(segments, args.output)
+        cache = None
+        if args.cache_dir:
+            cache = ResponseCache(
+                args.cache_dir,
+                ttl=args.cache_ttl * 3600,
+                negative_ttl=args.cache_404_ttl * 3600,
+                max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            )
+        with metrics.stage("download") as st:
+            segments = fetch_segments(ids, delay=args.delay, concurrency=args.concurrency,
+                                      cache=cache)
+            st.rows = len(segments)
+        # No snapshot here: a handful of fetched IDs written next to a bulk
+        # NDJSON would look fresh to _read_input and stand in for the full
+        # export, and a --delta load would then delete every other row
+        frames = _frames_for_sinks(segments, bool(args.export) + bool(args.load_db))
+        with metrics.stage("save") as st:
+            outputs = save_geojson(segments, args.output, precision=args.precision,
+                                   compact=args.compact)
+            st.rows = len(segments)
+            st.bytes_written = file_bytes(outputs)
 
     # ----- MODE: load -----
     elif args.mode == "load":
         input_path = args.input or args.output
-        ndjson_files = sorted(input_path.glob("*.ndjson")) if input_path.is_dir() else [input_path]
-        for f in ndjson_files:
-            segments.extend(parse_ndjson(f))
+        with metrics.stage("parse") as st:
+            segments = _read_input(input_path, args, filters, stage=st)
+            st.rows = _segment_total(segments)
         if not segments:
             log.error("No segments found in %s", input_path)
             sys.exit(1)
-        db_url = get_db_url(args.db_url)
-        load_to_postgis(segments, db_url, if_exists=args.db_if_exists, schema=args.schema)
+        # A filtered extract is not a full snapshot: never delete rows outside it
+        _load_db(segments, args, batch_size, delete_missing=filters is None, metrics=metrics)
         return  # skip the --load-db check below
 
     # ----- MODE: export -----
     elif args.mode == "export":
         input_path = args.input or args.output
-        ndjson_files = sorted(input_path.glob("*.ndjson")) if input_path.is_dir() else [input_path]
-        for f in ndjson_files:
-            segments.extend(parse_ndjson(f))
+        with metrics.stage("parse") as st:
+            segments = _read_input(input_path, args, filters, stage=st)
+            st.rows = _segment_total(segments)
         if not segments:
             log.error("No segments found in %s", input_path)
             sys.exit(1)
-        export_with_geopandas(segments, args.output, fmt=args.format)
+        _export(segments, args, batch_size, metrics)
         return
 
-    # Optionally load into PostGIS after fetching
+    # Optionally export and/or load into PostGIS after fetching; both reuse
+    # the same GeoDataFrames when the segments are held in memory
+    if args.export and segments:
+        _export(frames, args, batch_size, metrics)
+
     if args.load_db and segments:
-        db_url = get_db_url(args.db_url)
-        load_to_postgis(segments, db_url, if_exists=args.db_if_exists, schema=args.schema)
+        # Only a bulk download is a full snapshot; fetched IDs never delete rows
+        _load_db(frames, args, batch_size,
+                 delete_missing=args.mode == "bulk" and filters is None, metrics=metrics)
 
-    log.info("Done. %d total segments processed.", len(segments))
+    log.info("Done. %d total segments processed.", _segment_total(segments) or 0)
 
 
 if __name__ == "__main__":